@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark slugify của upload_data.py so với bản cũ (9 lần re.sub)
+
+Chạy trên mọi tên product và tên màu trong các file processed_*.json đi kèm,
+kiểm tra slug giống hệt nhau rồi in thời gian (lấy lần nhanh nhất).
+
+Chạy: python bench_slugify.py [--repeat 9]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from json_stream import iter_json_array
+from upload_data import UPLOAD_FILES, slugify
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacy_slugify(text: str) -> str:
+    """Bản cũ, giữ lại để so sánh"""
+    text = text.lower()
+    text = re.sub(r"[áàạảãăắằặẳẵâấầậẩẫ]", "a", text)
+    text = re.sub(r"[éèẹẻẽêếềệểễ]", "e", text)
+    text = re.sub(r"[íìịỉĩ]", "i", text)
+    text = re.sub(r"[óòọỏõôốồộổỗơớờợởỡ]", "o", text)
+    text = re.sub(r"[úùụủũưứừựửữ]", "u", text)
+    text = re.sub(r"[ýỳỵỷỹ]", "y", text)
+    text = re.sub(r"đ", "d", text)
+    text = re.sub(r"[^a-z0-9]+", "-", text)
+    text = text.strip("-")
+    text = re.sub(r"-+", "-", text)
+    return text
+
+
+def collect_names() -> List[str]:
+    """Tên product và tên màu theo đúng thứ tự upload_data.py gọi slugify"""
+    names = []
+    for filename, _, _, _ in UPLOAD_FILES:
+        for folder in (BASE_DIR, os.path.dirname(BASE_DIR)):
+            path = os.path.join(folder, filename)
+            if os.path.exists(path):
+                for product in iter_json_array(path):
+                    names.append(product.get("title") or product.get("name", ""))
+                    names.extend(color.get("name", "") for color in product.get("colorOptions", []))
+                break
+    return names
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="So sánh slugify mới với bản cũ")
+    parser.add_argument("--repeat", type=int, default=9, help="Số lần đo")
+    args = parser.parse_args(argv)
+
+    names = collect_names()
+    mismatches = [name for name in names if slugify(name) != legacy_slugify(name)]
+    print(f"[INFO] {len(names)} tên ({len(set(names))} khác nhau), {len(mismatches)} slug khác bản cũ")
+    for name in mismatches[:10]:
+        print(f"[ERROR] {name!r}: {legacy_slugify(name)!r} != {slugify(name)!r}")
+
+    legacy_time = best_time(lambda: [legacy_slugify(name) for name in names], args.repeat)
+    cold_time = best_time(lambda: (slugify.cache_clear(), [slugify(name) for name in names]), args.repeat)
+    uncached_time = best_time(lambda: [slugify.__wrapped__(name) for name in names], args.repeat)
+    print(f"[STATS] Bản cũ:              {legacy_time * 1000:8.2f}ms")
+    print(f"[STATS] Mới, không cache:    {uncached_time * 1000:8.2f}ms ({legacy_time / uncached_time:.1f}x)")
+    print(f"[STATS] Mới, cache từ đầu:   {cold_time * 1000:8.2f}ms ({legacy_time / cold_time:.1f}x)")
+    warm_time = best_time(lambda: [slugify(name) for name in names], args.repeat)
+    print(f"[STATS] Mới, cache đã có:    {warm_time * 1000:8.2f}ms ({legacy_time / warm_time:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
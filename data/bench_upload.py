@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đo hiệu năng upload_data.py với API giả lập (mock_api.py)
+
+Mỗi chế độ upload chạy với một mock server mới (tiến trình riêng để không
+tranh GIL với uploader), upload toàn bộ các file processed_*.json đi kèm
+repo rồi in số request, req/s, latency p50/p95/p99 và tổng thời gian.
+
+Chạy: python bench_upload.py [--latency 5] [--modes sequential workers8 ...] [--output kết_quả.json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+from upload_data import UPLOAD_FILES, UploadStats
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Tên chế độ -> tham số truyền cho upload_all_*
+MODES: Dict[str, Dict[str, Any]] = {
+    "sequential": {"workers": 1, "batch_size": 0},
+    "workers8": {"workers": 8, "batch_size": 0},
+    "workers8-batch50": {"workers": 8, "batch_size": 50},
+    "adaptive": {"workers": 32, "batch_size": 0, "adaptive": True},
+}
+
+
+def find_upload_files() -> List[Tuple[str, Any, int]]:
+    """(đường dẫn, hàm upload, categoryId) của các file có sẵn, tìm trong data/ rồi thư mục gốc"""
+    found = []
+    for filename, upload_func, category_id, _ in UPLOAD_FILES:
+        for folder in (BASE_DIR, os.path.dirname(BASE_DIR)):
+            path = os.path.join(folder, filename)
+            if os.path.exists(path):
+                found.append((path, upload_func, category_id))
+                break
+    return found
+
+
+def start_mock_process(server_args: List[str]) -> Tuple[subprocess.Popen, str]:
+    """Chạy mock_api.py ở port trống, chờ tới khi server nhận request"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BASE_DIR, "mock_api.py"), "--port", str(port), *server_args],
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            requests.get(f"{base_url}/__stats", timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Không khởi động được mock_api.py")
+            time.sleep(0.05)
+
+
+def run_mode(name: str, options: Dict[str, Any], files: List[Tuple[str, Any, int]], server_args: List[str]) -> Dict[str, Any]:
+    process, base_url = start_mock_process(server_args)
+    os.environ["API_BASE_URL"] = base_url
+    merged = UploadStats()
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            for path, upload_func, category_id in files:
+                stats = upload_func(path, category_id, **options)
+                if stats is not None:
+                    merged.latencies.extend(stats.latencies)
+                    merged.errors += stats.errors
+                    merged.retries += stats.retries
+        wall_time = time.perf_counter() - started
+        server_stats = requests.get(f"{base_url}/__stats", timeout=10).json()
+    finally:
+        process.terminate()
+        process.wait()
+
+    total = len(merged.latencies)
+    return {
+        "mode": name,
+        "options": options,
+        "requests": total,
+        "errors": merged.errors,
+        "retries": merged.retries,
+        "products": server_stats["products"],
+        "children": sum(server_stats["children"].values()),
+        "wall_time": round(wall_time, 3),
+        "requests_per_sec": round(total / wall_time, 1) if wall_time > 0 else 0.0,
+        "p50_ms": round(merged.percentile(50) * 1000, 2),
+        "p95_ms": round(merged.percentile(95) * 1000, 2),
+        "p99_ms": round(merged.percentile(99) * 1000, 2),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print(f"\n{'Chế độ':<18}{'Requests':>9}{'Lỗi':>6}{'Retry':>7}{'Wall (s)':>10}{'req/s':>9}"
+          f"{'p50':>8}{'p95':>8}{'p99':>8}  Product/con")
+    for r in results:
+        print(f"{r['mode']:<18}{r['requests']:>9}{r['errors']:>6}{r['retries']:>7}{r['wall_time']:>10.2f}"
+              f"{r['requests_per_sec']:>9.1f}{r['p50_ms']:>8.1f}{r['p95_ms']:>8.1f}{r['p99_ms']:>8.1f}"
+              f"  {r['products']}/{r['children']}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark upload_data.py với API giả lập")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="Các chế độ cần đo")
+    parser.add_argument("--latency", type=float, default=5.0, help="Độ trễ mỗi request của mock (ms)")
+    parser.add_argument("--jitter", type=float, default=2.0, help="Độ trễ ngẫu nhiên thêm tối đa (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Tỉ lệ mock trả về 503 (0-1)")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Mock trả về 429 khi vượt quá N request đồng thời")
+    parser.add_argument("--no-bulk", action="store_true", help="Mock không hỗ trợ endpoint /bulk")
+    parser.add_argument("--output", help="Ghi kết quả dạng JSON ra file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    files = find_upload_files()
+    if not files:
+        print("[ERROR] Không tìm thấy file processed_*.json nào")
+        return 1
+    server_args = [
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate), "--max-concurrency", str(args.max_concurrency),
+    ] + (["--no-bulk"] if args.no_bulk else [])
+    print(f"[INFO] {len(files)} file: {', '.join(os.path.basename(path) for path, _, _ in files)}")
+    print(f"[INFO] Mock: latency={args.latency}ms jitter={args.jitter}ms error_rate={args.error_rate} "
+          f"max_concurrency={args.max_concurrency or 'không giới hạn'}")
+
+    results = []
+    for name in args.modes:
+        print(f"[INFO] Đang chạy chế độ {name} ...")
+        results.append(run_mode(name, MODES[name], files, server_args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"server": server_args, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Đã ghi kết quả: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
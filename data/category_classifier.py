@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phân loại categoryId theo tên sản phẩm cho upload_data.py
+
+Toàn bộ từ khóa được biên dịch thành một regex duy nhất, tên sản phẩm chỉ
+được quét một lần bằng `finditer`; mỗi từ khóa tìm thấy tra ra danh mục của nó
+và danh mục ưu tiên cao nhất (điện thoại > laptop > đồng hồ > máy tính bảng)
+thắng, kể cả khi tên chứa từ khóa của nhiều danh mục ("Apple Watch ... iPhone").
+categoryId lấy từ biến môi trường CATEGORY_ID_* (đọc một lần khi tạo bộ phân loại).
+
+Chạy: python category_classifier.py processed_phones_data.json [...]
+để xem phân bố categoryId của cả file.
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from json_stream import iter_json_array
+
+# (danh mục, biến môi trường, categoryId mặc định, từ khóa) theo thứ tự ưu tiên
+CATEGORY_RULES: List[Tuple[str, str, int, Tuple[str, ...]]] = [
+    ("phone", "CATEGORY_ID_PHONE", 2, ("điện thoại", "phone", "smartphone", "iphone", "android")),
+    ("laptop", "CATEGORY_ID_LAPTOP", 3, ("laptop", "máy tính xách tay", "notebook", "macbook")),
+    ("smartwatch", "CATEGORY_ID_SMARTWATCH", 5, ("đồng hồ", "smartwatch", "watch")),
+    ("tablet", "CATEGORY_ID_TABLET", 1, ("máy tính bảng", "tablet", "ipad")),
+]
+DEFAULT_CATEGORY = ("default", "CATEGORY_ID_DEFAULT", 2)
+
+
+def _env_category_id(env_name: str, default: int) -> int:
+    env_val = os.getenv(env_name)
+    if env_val and env_val.isdigit():
+        return int(env_val)
+    return default
+
+
+class CategoryClassifier:
+    """Bộ phân loại đã biên dịch: tên sản phẩm -> (danh mục, categoryId)"""
+
+    def __init__(self, rules: List[Tuple[str, str, int, Tuple[str, ...]]] = CATEGORY_RULES):
+        self.category_ids: Dict[str, int] = {
+            name: _env_category_id(env_name, default) for name, env_name, default, _ in rules
+        }
+        default_name, env_name, default = DEFAULT_CATEGORY
+        self.default_name = default_name
+        self.category_ids[default_name] = _env_category_id(env_name, default)
+        self.priority: Dict[str, int] = {name: rank for rank, (name, _, _, _) in enumerate(rules)}
+        self.keyword_category: Dict[str, str] = {}
+        for name, _, _, keywords in rules:
+            for keyword in keywords:
+                self.keyword_category.setdefault(keyword, name)
+        # Bọc trong lookahead để các từ khóa chồng lên nhau ("laptophone") đều được tìm thấy
+        alternation = "|".join(re.escape(k) for k in self.keyword_category)
+        self.pattern = re.compile(f"(?=({alternation}))")
+
+    def category(self, name: str) -> str:
+        best = self.default_name
+        best_rank = len(self.priority)
+        for match in self.pattern.finditer((name or "").lower()):
+            category = self.keyword_category[match.group(1)]
+            rank = self.priority[category]
+            if rank < best_rank:
+                best, best_rank = category, rank
+                if rank == 0:
+                    break
+        return best
+
+    def classify(self, name: str) -> int:
+        return self.category_ids[self.category(name)]
+
+
+@lru_cache(maxsize=None)
+def get_category_classifier() -> CategoryClassifier:
+    """Bộ phân loại dùng chung, tạo một lần ở lần gọi đầu tiên"""
+    return CategoryClassifier()
+
+
+def classify_file(file_path: str, classifier: Optional[CategoryClassifier] = None) -> Counter:
+    """Đếm số sản phẩm theo (danh mục, categoryId) trong một file processed_*.json"""
+    classifier = classifier or get_category_classifier()
+    counts: Counter = Counter()
+    for product in iter_json_array(file_path):
+        category = classifier.category(product.get("name") or product.get("title", ""))
+        counts[(category, classifier.category_ids[category])] += 1
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Phân bố categoryId theo tên sản phẩm trong file processed_*.json")
+    parser.add_argument("files", nargs="+", help="Các file processed_*.json")
+    args = parser.parse_args(argv)
+
+    classifier = get_category_classifier()
+    for file_path in args.files:
+        if not os.path.exists(file_path):
+            print(f"[ERROR] Không tìm thấy file: {file_path}")
+            return 1
+        counts = classify_file(file_path, classifier)
+        total = sum(counts.values())
+        print(f"\n[INFO] {os.path.basename(file_path)}: {total} sản phẩm")
+        for (category, category_id), count in counts.most_common():
+            print(f"  {category:<12} categoryId={category_id:<4} {count:>6} ({count / total * 100:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đọc/ghi file JSON dạng mảng (processed_*.json) theo từng phần tử
+
+`iter_json_array` trả về lần lượt từng sản phẩm mà không nạp cả file vào bộ
+nhớ; `write_json_array` ghi lại với định dạng giống hệt
+`json.dump(data, f, ensure_ascii=False, indent=2)`.
+"""
+
+import json
+import os
+import re
+from typing import Any, Iterable, Iterator
+
+WHITESPACE = re.compile(r"\s*")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Duyệt từng phần tử của mảng JSON cấp cao nhất trong file"""
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                break
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"File không phải là mảng JSON: {file_path}")
+        pos += 1
+        expect_value = True
+        # Vừa đọc dấu ',': phải có phần tử tiếp theo, "[1,]" không hợp lệ như json.load
+        after_comma = False
+        read_size = chunk_size
+
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"Mảng JSON chưa đóng: {file_path}")
+                more = f.read(read_size)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+
+            if buf[pos] == "]":
+                if after_comma:
+                    raise ValueError(f"Dấu ',' thừa trước ']' tại vị trí {pos} trong {file_path}")
+                return
+            if not expect_value:
+                if buf[pos] != ",":
+                    raise ValueError(f"Thiếu dấu ',' tại vị trí {pos} trong {file_path}")
+                pos += 1
+                expect_value = after_comma = True
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                item, end = None, -1
+            # Phần tử chưa đọc đủ (hoặc có thể còn tiếp như số ở cuối buffer): đọc thêm
+            if end < 0 or (end >= len(buf) and not eof):
+                if eof:
+                    raise ValueError(f"JSON không hợp lệ tại vị trí {pos} trong {file_path}")
+                more = f.read(read_size)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                # Phần tử lớn hơn buffer: tăng dần kích thước đọc để tránh parse lại nhiều lần
+                read_size *= 2
+                continue
+
+            yield item
+            pos = end
+            expect_value = after_comma = False
+            read_size = chunk_size
+            # Bỏ phần đã đọc để buffer không phình ra
+            if pos > chunk_size:
+                buf = buf[pos:]
+                pos = 0
+
+
+def write_json_array(file_path: str, items: Iterable[Any]) -> int:
+    """Ghi mảng JSON theo từng phần tử (ghi ra file tạm rồi thay thế), trả về số phần tử"""
+    tmp_path = f"{file_path}.tmp"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for item in items:
+                f.write("[\n  " if count == 0 else ",\n  ")
+                f.write(json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+                count += 1
+            f.write("\n]" if count else "[]")
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, file_path)
+    return count
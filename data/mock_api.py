@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API giả lập (chạy local) cho upload_data.py, dùng để đo hiệu năng upload
+
+Hỗ trợ các endpoint mà upload_data.py gọi:
+  GET  /api/v1/products?page=N&limit=M (page từ 1, trả về {"data": [...], "total": ...})
+  POST /api/v1/products, PUT /api/v1/products/{id}
+  POST /api/v1/product-colors | product-images | product-specifications
+  POST <endpoint con>/bulk (body là mảng payload, tắt bằng --no-bulk)
+  GET  /__stats  số request theo endpoint/status
+Có thể giả lập độ trễ, lỗi 503 ngẫu nhiên và 429 khi quá số request đồng thời.
+
+Chạy: python mock_api.py --port 8080 --latency 20 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+PRODUCT_PATH = re.compile(r"^/api/v1/products(?:/(\d+))?$")
+CHILD_PATHS = {
+    "/api/v1/product-colors": "color",
+    "/api/v1/product-images": "image",
+    "/api/v1/product-specifications": "specification",
+}
+BULK_SUFFIX = "/bulk"
+
+
+class MockApiServer(ThreadingHTTPServer):
+    """HTTP server lưu product/request con trong bộ nhớ, cấu hình độ trễ và lỗi"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, max_concurrency: int = 0, bulk: bool = True):
+        super().__init__(address, MockApiHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_concurrency = max_concurrency
+        self.bulk = bulk
+        self.lock = threading.Lock()
+        self.active = 0
+        self.next_id = 0
+        self.products: Dict[int, Dict[str, Any]] = {}
+        self.children: Dict[str, int] = {kind: 0 for kind in CHILD_PATHS.values()}
+        self.requests: Dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str):
+        with self.lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "products": len(self.products),
+                "children": dict(self.children),
+                "requests": dict(self.requests),
+            }
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockApiServer
+
+    def setup(self):
+        super().setup()
+        # Tắt Nagle để độ trễ đo được không bị cộng thêm ~40ms do delayed ACK
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status: int, body: Optional[Any] = None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.server.count(f"{self.command} {self.path.split('?')[0]} {status}")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def do_GET(self):
+        if self.path == "/__stats":
+            return self.reply(200, self.server.stats())
+        url = urlsplit(self.path)
+        if url.path == "/api/v1/products":
+            return self.list_products(parse_qs(url.query))
+        self.reply(404, {"message": "Not found"})
+
+    def list_products(self, query: Dict[str, Any]):
+        server = self.server
+        try:
+            page = max(int(query.get("page", ["1"])[0]), 1)
+            limit = min(max(int(query.get("limit", ["20"])[0]), 1), 1000)
+        except ValueError:
+            return self.reply(400, {"message": "page/limit không hợp lệ"})
+        if server.latency:
+            time.sleep(server.latency)
+        with server.lock:
+            ids = sorted(server.products)
+            start = (page - 1) * limit
+            items = [{"id": i, **server.products[i]} for i in ids[start:start + limit]]
+        self.reply(200, {"data": items, "page": page, "limit": limit, "total": len(ids)})
+
+    def do_POST(self):
+        self.handle_write()
+
+    def do_PUT(self):
+        self.handle_write()
+
+    def handle_write(self):
+        server = self.server
+        payload = self.read_json()
+        with server.lock:
+            server.active += 1
+            active = server.active
+        try:
+            if server.max_concurrency and active > server.max_concurrency:
+                return self.reply(429, {"message": "Too many requests"})
+            delay = server.latency + random.uniform(0, server.jitter)
+            if delay > 0:
+                time.sleep(delay)
+            if server.error_rate and random.random() < server.error_rate:
+                return self.reply(503, {"message": "Service unavailable"})
+            self.route(payload)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def route(self, payload: Any):
+        server = self.server
+        path = self.path.split("?")[0]
+
+        match = PRODUCT_PATH.match(path)
+        if match:
+            product_id = match.group(1)
+            if self.command == "POST" and product_id is None:
+                new_id = server.new_id()
+                with server.lock:
+                    server.products[new_id] = payload
+                return self.reply(201, {"id": new_id})
+            if self.command == "PUT" and product_id is not None:
+                with server.lock:
+                    if int(product_id) not in server.products:
+                        return self.reply(404, {"message": "Product not found"})
+                    server.products[int(product_id)] = payload
+                return self.reply(200, {"id": int(product_id)})
+            return self.reply(405, {"message": "Method not allowed"})
+
+        bulk = path.endswith(BULK_SUFFIX)
+        kind = CHILD_PATHS.get(path[:-len(BULK_SUFFIX)] if bulk else path)
+        if kind is None or self.command != "POST" or (bulk and not server.bulk):
+            return self.reply(404, {"message": "Not found"})
+        items = payload if bulk else [payload]
+        if not isinstance(items, list) or not all(isinstance(item, dict) and item.get("productId") for item in items):
+            return self.reply(400, {"message": "productId is required"})
+        with server.lock:
+            server.children[kind] += len(items)
+        if bulk:
+            return self.reply(201, {"count": len(items)})
+        return self.reply(201, {"id": server.new_id()})
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, **options: Any) -> MockApiServer:
+    """Chạy server ở luồng nền (port=0: chọn port trống), dừng bằng server.shutdown()"""
+    server = MockApiServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="API giả lập cho upload_data.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Độ trễ mỗi request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Độ trễ ngẫu nhiên thêm tối đa (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Tỉ lệ trả về 503 (0-1)")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Trả về 429 khi vượt quá N request đồng thời")
+    parser.add_argument("--no-bulk", action="store_true", help="Không hỗ trợ endpoint /bulk (trả về 404)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = MockApiServer(
+        (args.host, args.port), latency=args.latency / 1000, jitter=args.jitter / 1000,
+        error_rate=args.error_rate, max_concurrency=args.max_concurrency, bulk=not args.no_bulk,
+    )
+    print(f"[INFO] Mock API chạy tại {server.base_url} (Ctrl+C để dừng)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[INFO] Đã dừng mock API")
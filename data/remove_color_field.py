@@ -4,11 +4,12 @@
 Script để xoa truong 'color' khoi cac file JSON da xu ly
 """
 
-import json
 import os
 import sys
 from typing import Dict, Any, List
 
+from json_stream import iter_json_array, write_json_array
+
 # Fix encoding cho Windows console
 if sys.platform == 'win32':
     import io
@@ -38,32 +39,31 @@ def remove_color_field(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 
 def process_file(file_path: str) -> bool:
-    """Xử lý một file JSON để xóa trường 'color'"""
+    """Xử lý một file JSON để xóa trường 'color' (đọc/ghi lần lượt từng sản phẩm)"""
     if not os.path.exists(file_path):
         print(f"[WARN] Khong tim thay file: {file_path}")
         return False
     
     try:
-        # Doc file
+        # Doc, xoa truong 'color' va luu lai tung san pham
         print(f"[INFO] Dang doc: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        removed_count = 0
+        
+        def iter_cleaned():
+            nonlocal removed_count
+            for product in iter_json_array(file_path):
+                cleaned, removed = remove_color_field([product])
+                removed_count += removed
+                yield cleaned[0]
         
-        if not isinstance(data, list):
+        try:
+            total_count = write_json_array(file_path, iter_cleaned())
+        except ValueError:
             print(f"[WARN] File khong phai la mang JSON: {file_path}")
             return False
         
-        print(f"   Tong so san pham: {len(data)}")
-        
-        # Xoa truong 'color'
-        cleaned_data, removed_count = remove_color_field(data)
-        
-        # Luu lai file
+        print(f"   Tong so san pham: {total_count}")
         print(f"   Da xoa truong 'color' tu {removed_count} san pham")
-        print(f"[INFO] Dang luu: {file_path}")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
-        
         print(f"[DONE] Hoan tat: {file_path}\n")
         return True
         
@@ -1,41 +1,37 @@
-import json
 import os
-from pathlib import Path
+import shutil
+
+from json_stream import iter_json_array, write_json_array
 
 
 def remove_storage_options_from_file(file_path: str, backup: bool = True):
-    """Xóa trường storageOptions từ file JSON"""
+    """Xóa trường storageOptions từ file JSON (đọc/ghi lần lượt từng sản phẩm)"""
     print(f"\n{'='*80}")
     print(f"Đang xử lý: {os.path.basename(file_path)}")
     
-    # Đọc file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    if not isinstance(data, list):
-        print(f"[ERROR] File không phải là mảng JSON")
-        return
-    
-    # Tạo backup nếu cần
+    # Tạo backup nếu cần (sao chép nguyên file, không cần parse)
     if backup:
         backup_path = f"{file_path}.backup"
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        shutil.copyfile(file_path, backup_path)
         print(f"[INFO] Đã tạo backup: {os.path.basename(backup_path)}")
     
     # Đếm số lượng sản phẩm có storageOptions
     removed_count = 0
-    total_count = len(data)
     
-    # Duyệt qua và xóa storageOptions
-    for item in data:
-        if isinstance(item, dict) and "storageOptions" in item:
-            del item["storageOptions"]
-            removed_count += 1
+    def iter_cleaned():
+        nonlocal removed_count
+        for item in iter_json_array(file_path):
+            if isinstance(item, dict) and "storageOptions" in item:
+                del item["storageOptions"]
+                removed_count += 1
+            yield item
     
-    # Lưu lại file
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Duyệt qua, xóa storageOptions và lưu lại file
+    try:
+        total_count = write_json_array(file_path, iter_cleaned())
+    except ValueError:
+        print(f"[ERROR] File không phải là mảng JSON")
+        return
     
     print(f"[OK] Đã xóa storageOptions từ {removed_count}/{total_count} sản phẩm")
     print(f"[OK] Đã lưu file: {os.path.basename(file_path)}")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chỉ mục hash nội dung cho upload tăng dần (delta) của upload_data.py
+
+Mỗi product (theo slug) lưu productId, hash payload product và hash từng
+request con (màu/ảnh/thông số). Lần chạy sau chỉ gửi product mới, cập nhật
+product có payload thay đổi và thêm các request con chưa từng gửi.
+
+File chỉ mục là JSONL: trong lúc chạy các thay đổi được ghi nối tiếp (an toàn
+khi tiến trình chết giữa chừng), khi `close()` file được ghi gọn lại.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from upload_journal import child_key
+
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """Hash ổn định của payload, bỏ qua productId (thay đổi theo môi trường)"""
+    body = {k: v for k, v in payload.items() if k != "productId"}
+    raw = json.dumps(body, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class DeltaIndex:
+    """Snapshot hash nội dung của lần upload trước, an toàn khi dùng đa luồng"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._slugs_by_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.stale_children: Set[str] = set()
+        self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entry = self.entries.setdefault(event["slug"], {"productId": None, "hash": "", "children": {}})
+                if "child" in event:
+                    entry["children"][event["child"]] = event["hash"]
+                else:
+                    entry["productId"] = event["productId"]
+                    entry["hash"] = event["hash"]
+                    entry["children"].update(event.get("children", {}))
+        for slug, entry in self.entries.items():
+            if entry["productId"]:
+                self._slugs_by_id[entry["productId"]] = slug
+        print(f"[INFO] Delta index {os.path.basename(self.path)}: {len(self.entries)} product")
+
+    def _append(self, events: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+        self._file.flush()
+
+    def product_id(self, slug: str) -> Optional[int]:
+        with self._lock:
+            entry = self.entries.get(slug)
+            return entry["productId"] if entry else None
+
+    def product_changed(self, slug: str, payload: Dict[str, Any]) -> bool:
+        with self._lock:
+            entry = self.entries.get(slug)
+            return entry is None or entry["hash"] != content_hash(payload)
+
+    def record_product(self, slug: str, product_id: int, payload: Dict[str, Any]):
+        digest = content_hash(payload)
+        with self._lock:
+            entry = self.entries.setdefault(slug, {"productId": None, "hash": "", "children": {}})
+            entry["productId"] = product_id
+            entry["hash"] = digest
+            self._slugs_by_id[product_id] = slug
+            self._append([{"slug": slug, "productId": product_id, "hash": digest}])
+
+    def pending_children(self, child_requests: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Trả về request con chưa từng gửi.
+
+        Request con cùng khóa nhưng nội dung khác chỉ được ghi vào
+        `stale_children`, vì API không có endpoint cập nhật request con.
+        """
+        pending = []
+        with self._lock:
+            for kind, payload in child_requests:
+                slug = self._slugs_by_id.get(payload["productId"])
+                children = self.entries[slug]["children"] if slug else {}
+                known = children.get(f"{kind}|{child_key(kind, payload)}")
+                if known is None:
+                    pending.append((kind, payload))
+                elif known != content_hash(payload):
+                    self.stale_children.add(f"{slug}|{kind}|{child_key(kind, payload)}")
+        return pending
+
+    def record_children(self, kind: str, payloads: List[Dict[str, Any]]):
+        events = []
+        with self._lock:
+            for payload in payloads:
+                slug = self._slugs_by_id.get(payload["productId"])
+                if slug is None:
+                    continue
+                key = f"{kind}|{child_key(kind, payload)}"
+                digest = content_hash(payload)
+                self.entries[slug]["children"][key] = digest
+                events.append({"slug": slug, "child": key, "hash": digest})
+            if events:
+                self._append(events)
+
+    def close(self):
+        """Ghi gọn chỉ mục: mỗi product một dòng"""
+        with self._lock:
+            self._file.close()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for slug, entry in self.entries.items():
+                    f.write(json.dumps({"slug": slug, **entry}, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        if self.stale_children:
+            print(f"[WARN] {len(self.stale_children)} màu/ảnh/thông số đã đổi nội dung, cần cập nhật thủ công")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chỉ mục slug -> product_id của các product đã có trên API cho upload_data.py
+
+Tải một lần khi bắt đầu (GET /api/v1/products?page=N&limit=M, lần lượt tới
+trang cuối) hoặc đọc từ file cache JSON, sau đó mỗi product chỉ cần tra dict
+thay vì gửi một request kiểm tra. Product tạo mới trong lúc upload cũng được
+thêm vào chỉ mục, và cache được ghi lại khi kết thúc để lần chạy sau dùng.
+
+Response danh sách được chấp nhận ở các dạng thường gặp: mảng product, hoặc
+object có mảng ở "data" / "items" / "content" (hoặc "data": {"items": [...]}).
+
+Phân trang: tên tham số trang/kích thước trang và số thứ tự trang đầu tiên
+đổi được qua EXISTING_PAGE_PARAM (mặc định "page"), EXISTING_SIZE_PARAM
+("limit") và EXISTING_PAGE_BASE (1; Spring dùng page=0&size=N). Không dựa vào
+số item mỗi trang vì server có thể giới hạn kích thước trang hoặc bỏ qua
+tham số: dừng theo totalPages / total / last nếu response có, nếu không thì
+đọc tới khi gặp trang rỗng.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+PRODUCTS_ENDPOINT = "/api/v1/products"
+PAGE_SIZE = 100
+PAGE_PARAM = "page"
+SIZE_PARAM = "limit"
+PAGE_BASE = 1
+# Chặn vòng lặp vô hạn nếu API bỏ qua tham số phân trang
+MAX_PAGES = 10000
+# Cách xử lý product đã tồn tại
+EXISTING_MODES = ("skip", "update")
+
+
+# Khóa thông tin phân trang thường gặp (ở gốc response hoặc trong data/meta/pagination/page)
+TOTAL_PAGES_KEYS = ("totalPages", "total_pages")
+TOTAL_ITEMS_KEYS = ("total", "totalElements", "totalItems", "totalCount", "total_count")
+META_KEYS = ("data", "meta", "pagination", "page")
+
+
+def get_paging_config() -> Tuple[str, str, int]:
+    """(tham số trang, tham số kích thước trang, trang đầu tiên) từ biến môi trường"""
+    page_base = os.getenv("EXISTING_PAGE_BASE", "")
+    return (
+        os.getenv("EXISTING_PAGE_PARAM") or PAGE_PARAM,
+        os.getenv("EXISTING_SIZE_PARAM") or SIZE_PARAM,
+        int(page_base) if page_base.isdigit() else PAGE_BASE,
+    )
+
+
+def _page_meta(body: Any) -> Dict[str, Any]:
+    """totalPages / total / last của response, chỉ các giá trị có mặt"""
+    meta: Dict[str, Any] = {}
+    if not isinstance(body, dict):
+        return meta
+    sources = [body] + [body[key] for key in META_KEYS if isinstance(body.get(key), dict)]
+    for source in sources:
+        for name, keys in (("totalPages", TOTAL_PAGES_KEYS), ("total", TOTAL_ITEMS_KEYS)):
+            for key in keys:
+                value = source.get(key)
+                if name not in meta and isinstance(value, int) and not isinstance(value, bool):
+                    meta[name] = value
+        if "last" not in meta and isinstance(source.get("last"), bool):
+            meta["last"] = source["last"]
+    return meta
+
+
+def _page_items(body: Any) -> List[Dict[str, Any]]:
+    if isinstance(body, list):
+        return body
+    if not isinstance(body, dict):
+        return []
+    for key in ("data", "items", "content"):
+        value = body.get(key)
+        if isinstance(value, list):
+            return value
+        if isinstance(value, dict):
+            return _page_items(value)
+    return []
+
+
+class ExistingProducts:
+    """slug -> product_id của product đã có, an toàn khi dùng đa luồng
+
+    mode="skip": bỏ qua hẳn product đã có (không gửi product lẫn request con).
+    mode="update": cập nhật product (PUT) rồi gửi các request con chưa có trong
+    journal/delta index (API không có endpoint cập nhật request con).
+    Product journal/delta index đã biết không đi qua chỉ mục này.
+    """
+
+    def __init__(self, slugs: Optional[Dict[str, int]] = None, mode: str = "skip", cache_path: Optional[str] = None):
+        if mode not in EXISTING_MODES:
+            raise ValueError(f"mode phải là một trong {EXISTING_MODES}")
+        self.slugs: Dict[str, int] = dict(slugs or {})
+        self.mode = mode
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def product_id(self, slug: str) -> Optional[int]:
+        return self.slugs.get(slug)
+
+    def add(self, slug: str, product_id: int):
+        with self._lock:
+            self.slugs[slug] = product_id
+
+    def save(self):
+        """Ghi cache (ghi ra file tạm rồi đổi tên để không hỏng cache khi bị ngắt)"""
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.slugs, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+
+
+def fetch_existing_slugs(session: requests.Session, base_url: str, page_size: int = PAGE_SIZE,
+                         page_param: Optional[str] = None, size_param: Optional[str] = None,
+                         page_base: Optional[int] = None) -> Dict[str, int]:
+    """Tải toàn bộ danh sách product theo trang, trả về slug -> id
+
+    Tham số phân trang mặc định lấy từ get_paging_config().
+    """
+    default_page_param, default_size_param, default_page_base = get_paging_config()
+    page_param = page_param or default_page_param
+    size_param = size_param or default_size_param
+    page_base = default_page_base if page_base is None else page_base
+
+    slugs: Dict[str, int] = {}
+    received = 0
+    meta: Dict[str, Any] = {}
+    previous_ids: Optional[List[Any]] = None
+    for index in range(MAX_PAGES):
+        params = {page_param: page_base + index, size_param: page_size}
+        resp = session.get(f"{base_url}{PRODUCTS_ENDPOINT}", params=params, timeout=30)
+        resp.raise_for_status()
+        body = resp.json()
+        items = _page_items(body)
+        if not items:
+            break
+        ids = [item.get("id") for item in items]
+        if ids == previous_ids:
+            # Server bỏ qua tham số trang: đọc tiếp chỉ nhận lại đúng trang này
+            print(f"[WARN] Trang {params[page_param]} giống hệt trang trước, API có thể không hỗ trợ "
+                  f"tham số '{page_param}' (đổi bằng EXISTING_PAGE_PARAM); dừng tải danh sách")
+            break
+        previous_ids = ids
+        received += len(items)
+        for item in items:
+            if item.get("slug") and item.get("id"):
+                slugs[item["slug"]] = item["id"]
+
+        meta = _page_meta(body)
+        if meta.get("last") is True:
+            break
+        if "totalPages" in meta and index + 1 >= meta["totalPages"]:
+            break
+        if "total" in meta and received >= meta["total"]:
+            break
+    else:
+        print(f"[WARN] Đã đọc {MAX_PAGES} trang mà chưa hết danh sách product")
+    if meta.get("total", 0) > received:
+        print(f"[WARN] Chỉ nhận {received}/{meta['total']} product, kiểm tra trang đầu tiên "
+              f"(EXISTING_PAGE_BASE={page_base}) và tham số phân trang")
+    return slugs
+
+
+def load_existing_products(session: requests.Session, base_url: str, mode: str = "skip", cache_path: Optional[str] = None, refresh: bool = False) -> ExistingProducts:
+    """Đọc chỉ mục từ cache nếu có (trừ khi refresh), nếu không thì tải từ API và ghi cache"""
+    if cache_path and not refresh and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            existing = ExistingProducts(json.load(f), mode, cache_path)
+        print(f"[INFO] Đọc {len(existing)} slug đã có từ cache {cache_path}")
+        return existing
+    existing = ExistingProducts(fetch_existing_slugs(session, base_url), mode, cache_path)
+    print(f"[INFO] Đã tải {len(existing)} slug đã có từ API")
+    existing.save()
+    return existing
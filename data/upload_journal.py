@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal upload dạng JSONL (append-only) để chạy lại upload_data.py không bị trùng
+
+Mỗi dòng là một sự kiện:
+  {"event": "product", "slug": "...", "productId": 123}
+  {"event": "child", "productId": 123, "kind": "image", "key": "https://..."}
+Khi khởi động lại, journal được đọc lại để bỏ qua product đã tạo và các
+màu/ảnh/thông số đã gửi thành công.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def child_key(kind: str, payload: Dict[str, Any]) -> str:
+    """Khóa định danh một request con trong phạm vi một product"""
+    if kind == "color":
+        return payload.get("slug", "")
+    if kind == "image":
+        return payload.get("url", "")
+    return f"{payload.get('groupName', '')}|{payload.get('label', '')}"
+
+
+class UploadJournal:
+    """Ghi lại product/request con đã upload thành công, an toàn khi dùng đa luồng"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.products: Dict[str, int] = {}
+        self.children: Dict[int, Set[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dòng cuối có thể bị cắt ngang khi tiến trình chết giữa chừng
+                    continue
+                if entry.get("event") == "product":
+                    self.products[entry["slug"]] = entry["productId"]
+                elif entry.get("event") == "child":
+                    self.children.setdefault(entry["productId"], set()).add((entry["kind"], entry["key"]))
+        print(f"[INFO] Journal {os.path.basename(self.path)}: {len(self.products)} product đã upload")
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+        self._file.flush()
+
+    def product_id(self, slug: str) -> Optional[int]:
+        with self._lock:
+            return self.products.get(slug)
+
+    def record_product(self, slug: str, product_id: int):
+        with self._lock:
+            self.products[slug] = product_id
+            self._append([{"event": "product", "slug": slug, "productId": product_id}])
+
+    def pending_children(self, child_requests: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Lọc bỏ các request con đã gửi thành công ở lần chạy trước"""
+        with self._lock:
+            return [
+                (kind, payload) for kind, payload in child_requests
+                if (kind, child_key(kind, payload)) not in self.children.get(payload["productId"], ())
+            ]
+
+    def record_children(self, kind: str, payloads: List[Dict[str, Any]]):
+        entries = []
+        with self._lock:
+            for payload in payloads:
+                key = child_key(kind, payload)
+                self.children.setdefault(payload["productId"], set()).add((kind, key))
+                entries.append({"event": "child", "productId": payload["productId"], "kind": kind, "key": key})
+            self._append(entries)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
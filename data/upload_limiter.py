@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Điều khiển số request đồng thời kiểu AIMD cho upload_data.py
+
+Giới hạn tăng dần (+1 mỗi "cửa sổ" request thành công) khi latency ổn định,
+giảm một nửa khi API trả về 429/5xx hoặc lỗi kết nối, giảm nhẹ khi latency
+tăng vọt so với mức nền. Header Retry-After của 429/503 tạm dừng mọi request
+mới cho tới hết thời gian chờ.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Mã lỗi được coi là API đang quá tải
+THROTTLE_STATUSES = (429, 502, 503, 504)
+# Giảm khi quá tải / khi latency cao
+BACKOFF_FACTOR = 0.5
+LATENCY_BACKOFF_FACTOR = 0.9
+# Latency ngắn hạn vượt quá TOLERANCE lần mức nền thì coi là nghẽn
+LATENCY_TOLERANCE = 2.0
+# Hệ số EWMA của latency ngắn hạn và latency nền (dài hạn)
+LATENCY_SMOOTHING = 0.2
+BASELINE_SMOOTHING = 0.01
+# Retry-After tối đa được tôn trọng (giây)
+MAX_RETRY_AFTER = 60.0
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    """Số giây chờ từ header Retry-After (chỉ hỗ trợ dạng số giây)"""
+    if not value:
+        return 0.0
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        return 0.0
+
+
+class AdaptiveLimiter:
+    """Giới hạn số request đang chạy, tự điều chỉnh trong [min_limit, max_limit]"""
+
+    def __init__(self, max_limit: int, initial_limit: int = 2, min_limit: int = 1):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self.peak_limit = self.limit
+        self.in_flight = 0
+        self.backoffs = 0
+        self._cond = threading.Condition()
+        self._pause_until = 0.0
+        self._last_backoff = 0.0
+        self._smoothed: Optional[float] = None
+        self._baseline: Optional[float] = None
+
+    def acquire(self) -> float:
+        """Chờ tới khi còn chỗ, trả về thời điểm bắt đầu request"""
+        with self._cond:
+            while True:
+                wait_for = self._pause_until - time.monotonic()
+                if wait_for > 0:
+                    self._cond.wait(wait_for)
+                elif self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    break
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, status: Optional[int], retry_after: Optional[str] = None):
+        """Ghi nhận kết quả request; status=None nghĩa là lỗi kết nối/timeout"""
+        now = time.monotonic()
+        latency = now - started
+        with self._cond:
+            self.in_flight -= 1
+            if status is None or status in THROTTLE_STATUSES or status >= 500:
+                pause = parse_retry_after(retry_after) if status in (429, 503) else 0.0
+                if pause:
+                    self._pause_until = max(self._pause_until, now + pause)
+                self._backoff(started, now, BACKOFF_FACTOR)
+            else:
+                self._observe_latency(latency)
+                if self._smoothed > self._baseline * LATENCY_TOLERANCE:
+                    self._backoff(started, now, LATENCY_BACKOFF_FACTOR)
+                else:
+                    # Cộng thêm 1 sau khoảng `limit` request thành công
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                    self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+    def _backoff(self, started: float, now: float, factor: float):
+        # Chỉ giảm một lần cho mỗi đợt: bỏ qua request đã gửi trước lần giảm gần nhất
+        if started < self._last_backoff:
+            return
+        self._last_backoff = now
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.backoffs += 1
+
+    def _observe_latency(self, latency: float):
+        if self._smoothed is None:
+            self._smoothed = self._baseline = latency
+        # Nền thay đổi chậm nên chỉ các đợt latency tăng vọt mới bị coi là nghẽn
+        self._smoothed += LATENCY_SMOOTHING * (latency - self._smoothed)
+        self._baseline += BASELINE_SMOOTHING * (latency - self._baseline)
+
+    def summary(self) -> str:
+        return (f"giới hạn hiện tại={int(self.limit)}, cao nhất={int(self.peak_limit)}/{self.max_limit}, "
+                f"{self.backoffs} lần giảm tải")
+
+
+class RatePacer:
+    """Giãn đều các request để không vượt quá `rate` request/giây (dùng chung giữa các luồng)
+
+    Mỗi request được cấp một mốc thời gian cách mốc trước 1/rate giây; luồng
+    nào tới sớm thì ngủ tới mốc của mình. Không tích lũy "tín dụng" khi rảnh
+    nên không có đợt dồn request sau một khoảng chờ.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SharedBudget:
+    """Giới hạn tổng số request đồng thời của nhiều nhóm (category), chia lượt vòng tròn
+
+    Khi hết chỗ, mỗi chỗ trống được cấp lần lượt cho nhóm tiếp theo đang có
+    request chờ, nên các nhóm cùng chạy nhận phần bằng nhau; nhóm xong trước
+    thì phần của nó chuyển cho các nhóm còn lại.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(limit, 1)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._owners: List[str] = []
+        self._waiting: Dict[str, int] = {}
+        self._granted: Dict[str, int] = {}
+        self._turn = 0
+
+    def share(self, owner: str) -> "BudgetShare":
+        with self._cond:
+            if owner not in self._waiting:
+                self._owners.append(owner)
+                self._waiting[owner] = 0
+                self._granted[owner] = 0
+        return BudgetShare(self, owner)
+
+    def acquire(self, owner: str):
+        with self._cond:
+            self._waiting[owner] += 1
+            self._dispatch()
+            while not self._granted[owner]:
+                self._cond.wait()
+            self._granted[owner] -= 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        # Cấp chỗ trống theo vòng tròn cho các nhóm đang chờ
+        granted = False
+        while self.in_flight < self.limit and any(self._waiting.values()):
+            owner = self._owners[self._turn % len(self._owners)]
+            self._turn += 1
+            if self._waiting[owner]:
+                self._waiting[owner] -= 1
+                self._granted[owner] += 1
+                self.in_flight += 1
+                granted = True
+        if granted:
+            self._cond.notify_all()
+
+
+class BudgetShare:
+    """Phần của một nhóm trong SharedBudget, gán vào UploadSession.budget"""
+
+    def __init__(self, budget: SharedBudget, owner: str):
+        self.budget = budget
+        self.owner = owner
+
+    def acquire(self):
+        self.budget.acquire(self.owner)
+
+    def release(self):
+        self.budget.release()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Số liệu theo endpoint cho upload_data.py
+
+Mỗi request (kể cả lần thử lại) được ghi vào nhóm (method, endpoint) với số
+request, mã trạng thái, số bytes gửi đi và histogram latency (bucket cố định
+như Prometheus nên không phải giữ từng giá trị). Id trong đường dẫn được gộp
+thành {id}: PUT /api/v1/products/123 -> PUT /api/v1/products/{id}.
+
+Báo cáo xuất ra JSON hoặc Prometheus text format.
+"""
+
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Cận trên các bucket latency (giây), bucket cuối là +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+# Mã trạng thái dùng cho lỗi kết nối/timeout (không có response)
+CONNECTION_ERROR = "error"
+
+
+def endpoint_key(url: str) -> str:
+    return ID_SEGMENT.sub("/{id}", urlsplit(url).path)
+
+
+class EndpointStats:
+    """Số liệu của một (method, endpoint); chỉ dùng bên trong EndpointMetrics"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.statuses: Dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency: float, status: Optional[int], bytes_sent: int):
+        self.count += 1
+        self.bytes_sent += bytes_sent
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        key = str(status) if status is not None else CONNECTION_ERROR
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Ước lượng phân vị từ histogram (nội suy tuyến tính trong bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if self.buckets[i] and seen + self.buckets[i] >= rank:
+                return lower + (bound - lower) * (rank - seen) / self.buckets[i]
+            seen += self.buckets[i]
+            lower = bound
+        return self.latency_max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "statuses": dict(sorted(self.statuses.items())),
+            "bytes_sent": self.bytes_sent,
+            "latency": {
+                "sum": round(self.latency_sum, 4),
+                "mean": round(self.latency_sum / self.count, 4) if self.count else 0.0,
+                "p50": round(self.quantile(0.5), 4),
+                "p95": round(self.quantile(0.95), 4),
+                "p99": round(self.quantile(0.99), 4),
+                "max": round(self.latency_max, 4),
+                "buckets": {str(bound): n for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), self.buckets)},
+            },
+        }
+
+
+class EndpointMetrics:
+    """Gom số liệu request theo (method, endpoint), an toàn khi dùng đa luồng"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def record(self, method: str, url: str, latency: float, status: Optional[int], bytes_sent: int = 0):
+        key = (method.upper(), endpoint_key(url))
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats()
+            stats.add(latency, status, bytes_sent)
+
+    def _sorted(self) -> List[Tuple[Tuple[str, str], EndpointStats]]:
+        # Endpoint chiếm nhiều thời gian nhất lên đầu
+        with self._lock:
+            return sorted(self._endpoints.items(), key=lambda item: item[1].latency_sum, reverse=True)
+
+    def to_dict(self, labels: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        items = self._sorted()
+        total_time = sum(stats.latency_sum for _, stats in items)
+        endpoints = []
+        for (method, endpoint), stats in items:
+            entry = {"method": method, "endpoint": endpoint, **stats.to_dict()}
+            entry["time_share"] = round(stats.latency_sum / total_time, 4) if total_time else 0.0
+            endpoints.append(entry)
+        return {**(labels or {}), "endpoints": endpoints}
+
+    def write_json(self, path: str, labels: Optional[Dict[str, Any]] = None):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(labels), f, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, labels: Optional[Dict[str, Any]] = None) -> str:
+        base = "".join(f'{name}="{value}",' for name, value in (labels or {}).items())
+        lines = [
+            "# HELP upload_request_duration_seconds Latency request upload theo endpoint",
+            "# TYPE upload_request_duration_seconds histogram",
+        ]
+        items = self._sorted()
+        for (method, endpoint), stats in items:
+            series = f'{base}method="{method}",endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), stats.buckets):
+                cumulative += n
+                lines.append(f'upload_request_duration_seconds_bucket{{{series},le="{bound}"}} {cumulative}')
+            lines.append(f"upload_request_duration_seconds_sum{{{series}}} {stats.latency_sum:.6f}")
+            lines.append(f"upload_request_duration_seconds_count{{{series}}} {stats.count}")
+        lines += ["# HELP upload_requests_total Số request upload theo endpoint và mã trạng thái",
+                  "# TYPE upload_requests_total counter"]
+        for (method, endpoint), stats in items:
+            for status, n in sorted(stats.statuses.items()):
+                lines.append(f'upload_requests_total{{{base}method="{method}",endpoint="{endpoint}",status="{status}"}} {n}')
+        lines += ["# HELP upload_request_bytes_total Số bytes body đã gửi theo endpoint",
+                  "# TYPE upload_request_bytes_total counter"]
+        for (method, endpoint), stats in items:
+            lines.append(f'upload_request_bytes_total{{{base}method="{method}",endpoint="{endpoint}"}} {stats.bytes_sent}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, labels: Optional[Dict[str, Any]] = None):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(labels))
+
+    def print_table(self):
+        items = self._sorted()
+        if not items:
+            return
+        total_time = sum(stats.latency_sum for _, stats in items) or 1.0
+        print(f"[STATS] {'Endpoint':<42}{'Requests':>9}{'Lỗi':>6}{'KB gửi':>10}{'p50':>8}{'p95':>8}{'% thời gian':>12}")
+        for (method, endpoint), stats in items:
+            print(f"[STATS] {method + ' ' + endpoint:<42}{stats.count:>9}{stats.errors:>6}{stats.bytes_sent / 1024:>10.1f}"
+                  f"{stats.quantile(0.5) * 1000:>7.0f}ms{stats.quantile(0.95) * 1000:>6.0f}ms"
+                  f"{stats.latency_sum / total_time * 100:>11.1f}%")
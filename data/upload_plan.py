@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dry-run cho upload_data.py: dựng mọi payload mà upload_all_* sẽ gửi và ghi
+ra file kế hoạch NDJSON, không gọi API
+
+Payload được dựng bằng đúng các hàm của upload_data.py (build_product_payload,
+build_child_requests). Mỗi dòng là một request, nhóm theo endpoint (toàn bộ
+product trước, sau đó màu, ảnh, thông số):
+  {"ref": "tablets-1", "method": "POST", "endpoint": "/api/v1/products", "payload": {...}}
+  {"parentRef": "tablets-1", "kind": "color", "method": "POST", "endpoint": "/api/v1/product-colors",
+   "payload": {"productId": null, ...}}
+productId của request con để null, khi gửi thật sẽ được thay bằng id của product `parentRef`.
+
+Dựng payload là việc thuần CPU nên được chia theo lô chạy trên process pool.
+
+Chạy: python upload_plan.py [--output upload_plan.ndjson] [--workers 4]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from json_stream import iter_json_array
+from upload_data import (
+    CHILD_ENDPOINTS, PRODUCTS_ENDPOINT, UPLOAD_FILES,
+    build_child_requests, build_product_payload, has_price,
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PLAN_ENDPOINTS = [PRODUCTS_ENDPOINT, *CHILD_ENDPOINTS.values()]
+# Số product mỗi lô gửi cho tiến trình con
+CHUNK_SIZE = 50
+
+# (lines theo endpoint, bytes body theo endpoint, số product bỏ qua)
+ChunkResult = Tuple[Dict[str, List[str]], Dict[str, int], int]
+
+
+def compile_product(product: Dict[str, Any], category_id: int, ref: str) -> List[Dict[str, Any]]:
+    """Các request (product + màu/ảnh/thông số) cho một product"""
+    entries = [{"ref": ref, "method": "POST", "endpoint": PRODUCTS_ENDPOINT, "payload": build_product_payload(product, category_id)}]
+    for kind, payload in build_child_requests(product, None):
+        entries.append({"parentRef": ref, "kind": kind, "method": "POST", "endpoint": CHILD_ENDPOINTS[kind], "payload": payload})
+    return entries
+
+
+def _compile_chunk(job: Tuple[str, int, int, List[Dict[str, Any]]]) -> ChunkResult:
+    """Chạy trong tiến trình con: dựng và serialize một lô product"""
+    product_type, category_id, start, products = job
+    lines: Dict[str, List[str]] = {endpoint: [] for endpoint in PLAN_ENDPOINTS}
+    sizes = {endpoint: 0 for endpoint in PLAN_ENDPOINTS}
+    skipped = 0
+    for index, product in enumerate(products, start):
+        if not has_price(product):
+            skipped += 1
+            continue
+        for entry in compile_product(product, category_id, f"{product_type}-{index}"):
+            endpoint = entry["endpoint"]
+            lines[endpoint].append(json.dumps(entry, ensure_ascii=False))
+            # Kích thước body giống requests gửi đi (json=...)
+            sizes[endpoint] += len(json.dumps(entry["payload"]).encode("utf-8"))
+    return lines, sizes, skipped
+
+
+def iter_jobs(files: List[Tuple[str, int, str]], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, int, int, List[Dict[str, Any]]]]:
+    for file_path, category_id, product_type in files:
+        products = iter_json_array(file_path)
+        start = 1
+        while True:
+            chunk = list(itertools.islice(products, chunk_size))
+            if not chunk:
+                break
+            yield product_type, category_id, start, chunk
+            start += len(chunk)
+
+
+def ordered_map(executor: Optional[Executor], func: Callable[[Any], Any], jobs: Iterable[Any], window: int) -> Iterator[Any]:
+    """Như executor.map nhưng chỉ giữ tối đa `window` lô đang chạy (không đọc trước cả file)"""
+    if executor is None:
+        yield from map(func, jobs)
+        return
+    pending: deque = deque()
+    for job in jobs:
+        pending.append(executor.submit(func, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def compile_plan(files: List[Tuple[str, int, str]], output: str, workers: int = 1) -> Dict[str, Any]:
+    """Ghi kế hoạch upload ra `output`, trả về số request/bytes theo endpoint"""
+    tmp_paths = {endpoint: f"{output}.{i}.tmp" for i, endpoint in enumerate(PLAN_ENDPOINTS)}
+    tmp_files = {endpoint: open(path, "w", encoding="utf-8") for endpoint, path in tmp_paths.items()}
+    counts = {endpoint: 0 for endpoint in PLAN_ENDPOINTS}
+    sizes = {endpoint: 0 for endpoint in PLAN_ENDPOINTS}
+    skipped = 0
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for lines, chunk_sizes, chunk_skipped in ordered_map(executor, _compile_chunk, iter_jobs(files), workers * 2):
+                skipped += chunk_skipped
+                for endpoint, endpoint_lines in lines.items():
+                    if endpoint_lines:
+                        tmp_files[endpoint].write("\n".join(endpoint_lines) + "\n")
+                        counts[endpoint] += len(endpoint_lines)
+                    sizes[endpoint] += chunk_sizes[endpoint]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        for f in tmp_files.values():
+            f.close()
+        # Nối các file tạm theo thứ tự endpoint: product trước, request con sau
+        with open(output, "w", encoding="utf-8") as out:
+            for endpoint in PLAN_ENDPOINTS:
+                with open(tmp_paths[endpoint], "r", encoding="utf-8") as f:
+                    for block in iter(lambda: f.read(1 << 20), ""):
+                        out.write(block)
+    finally:
+        for endpoint, path in tmp_paths.items():
+            tmp_files[endpoint].close()
+            if os.path.exists(path):
+                os.remove(path)
+    return {
+        "endpoints": {endpoint: {"requests": counts[endpoint], "bytes": sizes[endpoint]} for endpoint in PLAN_ENDPOINTS},
+        "requests": sum(counts.values()),
+        "bytes": sum(sizes.values()),
+        "skipped": skipped,
+    }
+
+
+def find_plan_files() -> List[Tuple[str, int, str]]:
+    """(đường dẫn, categoryId, loại) của các file trong UPLOAD_FILES, tìm trong data/ rồi thư mục gốc"""
+    found = []
+    for filename, _, category_id, product_type in UPLOAD_FILES:
+        for folder in (BASE_DIR, os.path.dirname(BASE_DIR)):
+            path = os.path.join(folder, filename)
+            if os.path.exists(path):
+                found.append((path, category_id, product_type))
+                break
+        else:
+            print(f"[WARN] Không tìm thấy file: {filename}")
+    return found
+
+
+def print_plan_summary(summary: Dict[str, Any], output: str):
+    print(f"\n{'Endpoint':<34}{'Requests':>10}{'Bytes':>14}")
+    for endpoint, item in summary["endpoints"].items():
+        print(f"{endpoint:<34}{item['requests']:>10}{item['bytes']:>14,}")
+    print(f"{'TỔNG':<34}{summary['requests']:>10}{summary['bytes']:>14,}")
+    if summary["skipped"]:
+        print(f"[INFO] Đã bỏ qua {summary['skipped']} sản phẩm không có price")
+    print(f"[OK] Đã ghi kế hoạch: {output}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Dry-run: ghi các request upload ra file NDJSON, không gọi API")
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "upload_plan.ndjson"), help="File kế hoạch NDJSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Số tiến trình dựng payload")
+    args = parser.parse_args(argv)
+
+    files = find_plan_files()
+    if not files:
+        print("[ERROR] Không có file nào để dựng kế hoạch")
+        return 1
+    summary = compile_plan(files, args.output, args.workers)
+    print_plan_summary(summary, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gửi lại một file NDJSON các request với tốc độ được kiểm soát
+
+Nhận cả hai định dạng:
+  - kế hoạch từ upload_plan.py: product có "ref", request con có "parentRef"
+  - dead-letter từ upload_data.py --dead-letter (product kèm "children")
+Chạy hai lượt: lượt 1 gửi các request độc lập (tạo product, ghi lại id mới
+theo ref), lượt 2 gửi request con có parentRef với productId vừa được tạo.
+Mọi request đi qua một UploadSession dùng chung (connection pool, retry,
+circuit breaker) với `workers` luồng và không vượt quá `rate` request/giây.
+
+Request thất bại được ghi ra <file>.dead.jsonl (file dead-letter thì ghi đè
+chính nó) để có thể gửi lại lần nữa. Product và request con gửi lại thành
+công được ghi vào journal / delta index (--journal, --delta) và chỉ mục
+product đã có (nếu truyền vào), để lần upload sau không tạo lại.
+
+Chạy: python upload_replay.py upload_plan.ndjson [--rate 50] [--workers 8]
+      python upload_replay.py processed_phones_data.json.dead.jsonl --journal processed_phones_data.json.journal.jsonl
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+from upload_data import (
+    create_session, dead_letter, get_created_id, get_upload_workers, replay_entry,
+    send_child, send_json,
+)
+from upload_delta import DeltaIndex
+from upload_existing import ExistingProducts
+from upload_journal import UploadJournal
+from upload_limiter import RatePacer
+from upload_retry import DeadLetterLog, iter_dead_letters
+
+DEAD_LETTER_SUFFIX = ".dead.jsonl"
+
+
+def source_file(path: str) -> Optional[str]:
+    """File processed_*.json ứng với file dead-letter <file>.dead.jsonl (None nếu không phải)"""
+    return path[:-len(DEAD_LETTER_SUFFIX)] if path.endswith(DEAD_LETTER_SUFFIX) else None
+
+
+class ReplayState:
+    """Id product mới theo ref, số product đã tạo lại và nơi ghi nhận request thành công"""
+
+    def __init__(self, journal: Optional[UploadJournal] = None, delta: Optional[DeltaIndex] = None, existing: Optional[ExistingProducts] = None):
+        self.product_ids: Dict[str, Optional[int]] = {}
+        self.created = 0
+        self.journal = journal
+        self.delta = delta
+        self.existing = existing
+        self._lock = threading.Lock()
+
+    def record_product(self, payload: Dict[str, Any], product_id: Optional[int], ref: Optional[str] = None):
+        with self._lock:
+            self.created += 1
+            if ref is not None:
+                self.product_ids[ref] = product_id
+        slug = payload.get("slug")
+        if not product_id or not slug:
+            return
+        if self.journal is not None:
+            self.journal.record_product(slug, product_id)
+        if self.delta is not None:
+            self.delta.record_product(slug, product_id, payload)
+        if self.existing is not None:
+            self.existing.add(slug, product_id)
+
+    def on_sent(self, kind: str, payloads: List[Dict[str, Any]]):
+        for index in (self.journal, self.delta):
+            if index is not None:
+                index.record_children(kind, payloads)
+
+
+def send_entry(session: requests.Session, base_url: str, entry: Dict[str, Any], state: ReplayState) -> bool:
+    """Gửi một dòng kế hoạch/dead-letter, id của product có ref được lưu vào `state.product_ids`"""
+    parent_ref = entry.get("parentRef")
+    if parent_ref is not None:
+        product_id = state.product_ids.get(parent_ref)
+        if product_id is None:
+            dead_letter(session, entry["kind"], entry["method"], entry["endpoint"], entry["payload"],
+                        f"product {parent_ref} chưa được tạo", parentRef=parent_ref)
+            return False
+        return send_child(session, base_url, entry["kind"], {**entry["payload"], "productId": product_id}, state.on_sent)
+
+    ref = entry.get("ref")
+    if ref is None:
+        return replay_entry(session, base_url, entry, state.record_product, state.on_sent)
+    resp, error = send_json(session, entry["method"], base_url, entry["endpoint"], entry["payload"])
+    if error:
+        print(f"[ERROR] Tạo product {ref} thất bại: {error}")
+        dead_letter(session, "product", entry["method"], entry["endpoint"], entry["payload"], error, resp, ref=ref)
+        return False
+    state.record_product(entry["payload"], get_created_id(resp), ref)
+    return True
+
+
+def _run_pass(session: requests.Session, base_url: str, entries: Iterable[Dict[str, Any]], workers: int, state: ReplayState) -> List[int]:
+    """Gửi các dòng với `workers` luồng, trả về [số thành công, tổng số]"""
+    counts = [0, 0]
+    if workers <= 1:
+        for entry in entries:
+            counts[0] += send_entry(session, base_url, entry, state)
+            counts[1] += 1
+        return counts
+
+    max_pending = workers * 2
+    pending: Set[Future] = set()
+    entries = iter(entries)
+    entries_done = False
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while not entries_done and len(pending) < max_pending:
+                entry = next(entries, None)
+                if entry is None:
+                    entries_done = True
+                    break
+                pending.add(pool.submit(send_entry, session, base_url, entry, state))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                counts[1] += 1
+                try:
+                    counts[0] += future.result()
+                except requests.RequestException as e:
+                    print(f"[ERROR] {e}")
+    return counts
+
+
+def _iter_entries(path: str, with_parent: bool) -> Iterator[Dict[str, Any]]:
+    for entry in iter_dead_letters(path):
+        if ("parentRef" in entry) == with_parent:
+            yield entry
+
+
+def replay_file(path: str, workers: Optional[int] = None, rate: float = 0.0, retries: Optional[int] = None,
+                journal_path: Optional[str] = None, delta_path: Optional[str] = None,
+                existing: Optional[ExistingProducts] = None) -> bool:
+    """Gửi lại toàn bộ file; trả về True nếu mọi request đều thành công
+
+    Request thành công được ghi vào journal (journal_path), delta index
+    (delta_path) và chỉ mục `existing` nếu có.
+    """
+    if workers is None:
+        workers = get_upload_workers()
+    base_url = os.getenv("API_BASE_URL", "http://localhost:8080")
+    session = create_session(pool_size=workers, retries=retries)
+    if rate > 0:
+        session.pacer = RatePacer(rate)
+
+    failed_path = path if source_file(path) else f"{path}{DEAD_LETTER_SUFFIX}"
+    tmp_path = f"{failed_path}.tmp"
+    session.dead_letter = DeadLetterLog(tmp_path)
+    print(f"[INFO] Gửi lại {path} (workers={workers}, tốc độ={f'{rate:g} req/s' if rate > 0 else 'không giới hạn'})")
+
+    state = ReplayState(
+        UploadJournal(journal_path) if journal_path else None,
+        DeltaIndex(delta_path) if delta_path else None,
+        existing,
+    )
+    started = time.perf_counter()
+    try:
+        first = _run_pass(session, base_url, _iter_entries(path, with_parent=False), workers, state)
+        second = _run_pass(session, base_url, _iter_entries(path, with_parent=True), workers, state)
+    finally:
+        session.dead_letter.close()
+        if state.journal is not None:
+            state.journal.close()
+        if state.delta is not None:
+            state.delta.close()
+        if existing is not None:
+            existing.save()
+    wall_time = time.perf_counter() - started
+
+    if session.dead_letter.count:
+        os.replace(tmp_path, failed_path)
+        print(f"[WARN] {session.dead_letter.count} request thất bại đã ghi vào {failed_path}")
+    else:
+        os.remove(tmp_path)
+        if failed_path == path:
+            os.remove(path)
+
+    succeeded, total = first[0] + second[0], first[1] + second[1]
+    print(f"\n[DONE] Gửi lại thành công {succeeded}/{total} dòng ({state.created} product mới)")
+    sent = len(session.stats.latencies)
+    achieved = sent / wall_time if wall_time > 0 else 0.0
+    target = f" / mục tiêu {rate:g} req/s" if rate > 0 else ""
+    print(f"[STATS] Đạt {achieved:.1f} req/s{target}")
+    session.stats.print_summary()
+    session.metrics.print_table()
+    return succeeded == total
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gửi lại file kế hoạch / dead-letter NDJSON với tốc độ kiểm soát")
+    parser.add_argument("file", help="File NDJSON (upload_plan.py hoặc *.dead.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="Số luồng gửi song song (mặc định: UPLOAD_WORKERS hoặc 1)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Số request/giây tối đa (0 = không giới hạn)")
+    parser.add_argument("--retries", type=int, default=None, help="Số lần thử lại khi lỗi tạm thời (mặc định: UPLOAD_RETRIES hoặc 3)")
+    parser.add_argument("--journal", metavar="FILE", help="Ghi product/request con gửi lại thành công vào journal FILE")
+    parser.add_argument("--delta", metavar="FILE", help="Ghi product/request con gửi lại thành công vào delta index FILE")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.file):
+        print(f"[ERROR] Không tìm thấy file: {args.file}")
+        return 1
+    ok = replay_file(args.file, args.workers, args.rate, args.retries, journal_path=args.journal, delta_path=args.delta)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
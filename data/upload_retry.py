@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Retry, circuit breaker và dead-letter cho upload_data.py
+
+- RetryPolicy: số lần thử lại và thời gian chờ (exponential backoff có jitter)
+- CircuitBreaker: khi API lỗi liên tiếp, tạm dừng mọi request thay vì gửi
+  hàng nghìn request chắc chắn thất bại; sau thời gian chờ cho 1 request
+  thử, thành công thì chạy tiếp
+- DeadLetterLog: file NDJSON chứa các payload thất bại hẳn để gửi lại sau
+  (`python upload_data.py --replay <file>`)
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+# Status tạm thời: request chưa được xử lý, gửi lại an toàn với mọi method
+SAFE_RETRY_STATUSES = (429, 503)
+# Status có thể đã được xử lý một phần: chỉ gửi lại với method idempotent
+IDEMPOTENT_RETRY_STATUSES = (500, 502, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+DEFAULT_RETRIES = 3
+
+
+def get_upload_retries() -> int:
+    """Số lần thử lại lấy từ UPLOAD_RETRIES, mặc định 3 (0 = tắt)"""
+    env_val = os.getenv("UPLOAD_RETRIES")
+    if env_val and env_val.isdigit():
+        return int(env_val)
+    return DEFAULT_RETRIES
+
+
+def is_connect_error(error: BaseException) -> bool:
+    """Lỗi xảy ra trước khi request được gửi đi (không mở được kết nối)
+
+    ConnectTimeout, connection refused, lỗi DNS... thì server chắc chắn chưa
+    nhận request. Các lỗi kết nối khác như "Connection aborted"
+    (ProtocolError/RemoteDisconnected) có thể xảy ra sau khi body đã gửi xong.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    # requests bọc lỗi urllib3 trong MaxRetryError, nguyên nhân thật nằm ở .reason
+    reason = getattr(error.args[0], "reason", error.args[0])
+    # NewConnectionError và NameResolutionError đều là lớp con của ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def is_transient_status(status: int) -> bool:
+    """Status cho thấy API đang quá tải/lỗi (tính vào circuit breaker)"""
+    return status == 429 or status >= 500
+
+
+class RetryPolicy:
+    """Thử lại tối đa `retries` lần, chờ ngẫu nhiên trong [0, base * 2^n] (full jitter)"""
+
+    def __init__(self, retries: int = DEFAULT_RETRIES, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None, connect_error: bool = False) -> bool:
+        """attempt bắt đầu từ 0; status=None nghĩa là lỗi kết nối,
+        connect_error=True nếu lỗi xảy ra trước khi gửi request (xem is_connect_error)"""
+        if attempt >= self.retries:
+            return False
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if status is None:
+            # Lỗi sau khi đã gửi (read timeout, connection aborted): server có thể đã xử lý request
+            return idempotent or connect_error
+        if status in SAFE_RETRY_STATUSES:
+            return True
+        return idempotent and status in IDEMPOTENT_RETRY_STATUSES
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after:
+            try:
+                return min(max(float(retry_after), backoff), self.max_delay)
+            except ValueError:
+                pass
+        return backoff
+
+
+class CircuitBreaker:
+    """Ngắt mạch sau `threshold` lỗi liên tiếp, thời gian chờ tăng gấp đôi nếu thử lại vẫn lỗi"""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 5.0, max_cooldown: float = 120.0):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.failures = 0
+        self.trips = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._cond = threading.Condition()
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.threshold
+
+    def before_request(self):
+        """Chặn khi mạch đang ngắt; hết thời gian chờ thì cho đúng 1 request thử"""
+        with self._cond:
+            while self.is_open:
+                wait_for = self._open_until - time.monotonic()
+                if wait_for > 0:
+                    self._cond.wait(wait_for)
+                elif not self._probing:
+                    self._probing = True
+                    return
+                else:
+                    self._cond.wait()
+
+    def record(self, success: bool):
+        with self._cond:
+            if success:
+                if self.is_open:
+                    print("[INFO] API hoạt động trở lại, tiếp tục upload")
+                self.failures = 0
+                self.cooldown = self.base_cooldown
+                self._probing = False
+            else:
+                self.failures += 1
+                if self._probing or self.failures == self.threshold:
+                    if self._probing:
+                        self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                    self._probing = False
+                    self._open_until = time.monotonic() + self.cooldown
+                    self.trips += 1
+                    print(f"[WARN] API lỗi {self.failures} lần liên tiếp, tạm dừng upload {self.cooldown:.0f}s")
+            self._cond.notify_all()
+
+
+class DeadLetterLog:
+    """Ghi nối tiếp các payload thất bại hẳn (NDJSON), an toàn khi dùng đa luồng
+
+    Mỗi dòng: {"kind", "method", "endpoint", "payload", "error", "status", "time"}
+    và với product: "children" là các request con (productId = null) cần gửi
+    sau khi tạo được product.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, kind: str, method: str, endpoint: str, payload: Any, error: str, status: Optional[int] = None, **extra: Any):
+        entry = {
+            "kind": kind,
+            "method": method,
+            "endpoint": endpoint,
+            "payload": payload,
+            "error": error,
+            "status": status,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            **extra,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        if self.count:
+            print(f"[WARN] {self.count} payload thất bại đã ghi vào {self.path}")
+
+
+def iter_dead_letters(path: str) -> Iterator[Dict[str, Any]]:
+    """Đọc lại file dead-letter, bỏ qua dòng hỏng"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark từng bước của pipeline trên catalog tổng hợp ×10 / ×100 / ×1000
+
+Dữ liệu dựng từ cache.json đi kèm repo (build_inputs của bench_processors.py)
+nhân bản N lần, từ bản sao thứ 2 title và giá được làm lệch ngẫu nhiên theo
+--seed nên các lần chạy so sánh được với nhau. Với mỗi danh mục và hệ số,
+đo (lấy lần nhanh nhất trong --repeat lần):
+  extract, process_specifications, process_color_options, process_images,
+  process (process_records đầy đủ), json_write, csv_write và payload
+  (build_product_payload + build_child_requests của data/upload_data.py)
+
+Mặc định đo ×10 và ×100. ×1000 (197.000 bản ghi mỗi danh mục) cần chỉ định
+--scales 1000: mỗi danh mục cần hơn 6GB RAM và khoảng 5GB đĩa tạm (file JSON
+~3GB, CSV ~1.5GB), nên thường chạy riêng từng danh mục với --repeat 1.
+
+Kết quả ghi ra JSON (--output) và được so với baseline đã lưu
+(mặc định python/bench_baseline.json, không commit): bước nào chậm hơn
+baseline quá --tolerance thì trả về mã lỗi 1. --save-baseline ghi kết quả làm
+baseline mới. Baseline phụ thuộc máy đo: baseline ghi trên máy khác (platform
+hoặc số CPU khác) chỉ được in ra để tham khảo, không dùng để báo chậm đi.
+
+Chạy: python python/bench_pipeline.py [--scales 10 100] [--categories phone laptop]
+                                      [--repeat 3] [--output kết_quả.json] [--save-baseline]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(1, os.path.join(REPO_DIR, 'data'))
+
+from bench_processors import CATEGORIES, build_inputs
+from product_data_processor import parse_price
+from upload_data import UPLOAD_FILES, build_child_requests, build_product_payload
+
+DEFAULT_SCALES = (10, 100)
+STAGES = (
+    'extract', 'process_specifications', 'process_color_options', 'process_images',
+    'process', 'json_write', 'csv_write', 'payload',
+)
+DEFAULT_BASELINE = os.path.join(BASE_DIR, 'bench_baseline.json')
+# Bước nhanh hơn mức này (giây) không bị coi là chậm đi, tránh báo nhầm do nhiễu
+MIN_REGRESSION_SECONDS = 0.005
+# categoryId theo danh mục, lấy từ UPLOAD_FILES ('phones' -> 2, ...)
+CATEGORY_IDS = {product_type: category_id for _, _, category_id, product_type in UPLOAD_FILES}
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Thời gian nhanh nhất sau `repeat` lần và kết quả của lần chạy cuối"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def apply_each(func: Callable[[Any], Any], values: List[Any]):
+    """Gọi func cho từng phần tử, không giữ kết quả (tránh tốn bộ nhớ ở hệ số lớn)"""
+    for value in values:
+        func(value)
+
+
+def build_payloads(processed: List[Dict[str, Any]], category_id: int) -> int:
+    """Dựng mọi payload upload (product + request con), trả về số request"""
+    requests = 0
+    for product in processed:
+        build_product_payload(product, category_id)
+        requests += 1 + len(build_child_requests(product, 0))
+    return requests
+
+
+def bench_category(category: str, processor_class: type, raw_data: Dict[str, Any], repeat: int, tmp_dir: str) -> List[Dict[str, Any]]:
+    """Đo từng bước cho một danh mục, trả về một dòng kết quả mỗi bước"""
+    processor = processor_class()
+    processor.workers = 1
+    processor.csv_file = os.path.join(tmp_dir, f"{category}.csv")
+    json_path = os.path.join(tmp_dir, f"{category}.json")
+    category_id = CATEGORY_IDS.get(f"{category}s", 0)
+
+    timings: Dict[str, float] = {}
+    timings['extract'], records = best_time(lambda: processor.extract_records(raw_data), repeat)
+    for stage, field in (('process_specifications', 'specifications'), ('process_color_options', 'colorOptions'),
+                         ('process_images', 'images')):
+        func = getattr(processor, stage)
+        timings[stage], _ = best_time(lambda: apply_each(func, [r[field] for r in records]), repeat)
+    # Xóa bộ nhớ đệm giá để mọi lần đo đều bắt đầu như một lần chạy mới
+    timings['process'], processed = best_time(
+        lambda: (parse_price.cache_clear(), processor.process_records(records))[1], repeat)
+    timings['json_write'], _ = best_time(lambda: processor.save_json_data(processed, json_path), repeat)
+    timings['csv_write'], _ = best_time(lambda: processor.save_csv_data(records), repeat)
+    timings['payload'], _ = best_time(lambda: build_payloads(processed, category_id), repeat)
+
+    return [{
+        'category': category,
+        'stage': stage,
+        'records': len(records),
+        'seconds': round(timings[stage], 6),
+        'recordsPerSec': round(len(records) / timings[stage], 1) if timings[stage] > 0 else None,
+    } for stage in STAGES]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_info() -> Dict[str, Any]:
+    """Thông tin máy đo, baseline chỉ so sánh được khi trùng khớp"""
+    return {'platform': platform.platform(), 'cpuCount': os.cpu_count()}
+
+
+def baseline_machine_mismatch(baseline: Dict[str, Any]) -> List[str]:
+    """Các thông tin máy khác nhau giữa baseline và máy hiện tại"""
+    return [
+        f"{key}: {baseline.get(key)} ≠ {value}"
+        for key, value in machine_info().items() if baseline.get(key) != value
+    ]
+
+
+def run_suite(scales: List[int], categories: List[str], repeat: int, seed: int) -> Dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as tmp_dir:
+        for scale in scales:
+            inputs = build_inputs(scale, seed)
+            for category, processor_class, _, input_format in CATEGORIES:
+                if category not in categories:
+                    continue
+                print(f"⏳ ×{scale} {category} ...", flush=True)
+                for row in bench_category(category, processor_class, inputs[input_format], repeat, tmp_dir):
+                    results.append({'scale': scale, **row})
+            del inputs
+    return {
+        'generatedAt': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        **machine_info(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def result_key(row: Dict[str, Any]) -> Tuple[str, int, str]:
+    return row['category'], row['scale'], row['stage']
+
+
+def print_results(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    base = {result_key(row): row for row in baseline['results']} if baseline else {}
+    print(f"\n{'Danh mục':<12}{'Hệ số':>7}  {'Bước':<24}{'Bản ghi':>9}{'Giây':>10}{'Bản ghi/giây':>15}{'Baseline':>10}{'Tỉ lệ':>8}")
+    for row in report['results']:
+        old = base.get(result_key(row))
+        rate = f"{row['recordsPerSec']:,.0f}" if row['recordsPerSec'] is not None else '-'
+        ratio = f"{row['seconds'] / old['seconds']:.2f}" if old and old['seconds'] else '-'
+        old_seconds = f"{old['seconds']:.3f}" if old else '-'
+        print(f"{row['category']:<12}{'×' + str(row['scale']):>7}  {row['stage']:<24}{row['records']:>9}"
+              f"{row['seconds']:>10.3f}{rate:>15}{old_seconds:>10}{ratio:>8}")
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Các bước chậm hơn baseline quá `tolerance` (chỉ so các bước có ở cả hai)"""
+    base = {result_key(row): row for row in baseline['results']}
+    regressions = []
+    for row in report['results']:
+        old = base.get(result_key(row))
+        if not old or old['records'] != row['records']:
+            continue
+        if row['seconds'] > old['seconds'] * (1 + tolerance) and row['seconds'] - old['seconds'] > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{row['category']} ×{row['scale']} {row['stage']}: {old['seconds']:.3f}s -> {row['seconds']:.3f}s"
+                f" (×{row['seconds'] / old['seconds']:.2f})"
+            )
+    return regressions
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark từng bước pipeline trên catalog tổng hợp")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help="Hệ số nhân bản cache.json (10, 100, 1000...)")
+    parser.add_argument('--categories', nargs='+', choices=[c[0] for c in CATEGORIES],
+                        default=[c[0] for c in CATEGORIES], help="Các danh mục cần đo")
+    parser.add_argument('--repeat', type=int, default=3, help="Số lần đo mỗi bước (lấy lần nhanh nhất)")
+    parser.add_argument('--seed', type=int, default=42, help="Seed làm lệch title/giá của các bản sao")
+    parser.add_argument('--output', help="Ghi kết quả dạng JSON ra file")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="File baseline để so sánh")
+    parser.add_argument('--save-baseline', action='store_true', help="Ghi kết quả lần này làm baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Mức chậm hơn baseline cho phép (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if (baseline.get('seed'), baseline.get('repeat')) != (args.seed, args.repeat):
+            print(f"⚠️ Baseline đo với seed={baseline.get('seed')} repeat={baseline.get('repeat')}, kết quả có thể không so sánh được")
+
+    print(f"📦 Hệ số: {', '.join(f'×{s}' for s in args.scales)} | danh mục: {', '.join(args.categories)} "
+          f"| repeat={args.repeat} | seed={args.seed}")
+    report = run_suite(args.scales, args.categories, args.repeat, args.seed)
+    print_results(report, baseline)
+
+    if args.output:
+        write_json(args.output, report)
+        print(f"\n📄 Đã ghi kết quả: {args.output}")
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"\n📄 Đã ghi baseline: {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\n⚠️ Chưa có baseline ({args.baseline}), chạy với --save-baseline để tạo")
+        return 0
+
+    mismatch = baseline_machine_mismatch(baseline)
+    if mismatch:
+        print(f"\n⚠️ Baseline ({args.baseline}) đo trên máy khác ({'; '.join(mismatch)}), "
+              f"bỏ qua kiểm tra chậm đi. Chạy với --save-baseline để tạo baseline cho máy này")
+        return 0
+
+    regressions = find_regressions(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} bước chậm hơn baseline quá {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"\n✅ Không bước nào chậm hơn baseline quá {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
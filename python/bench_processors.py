@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark engine hợp nhất (ProductDataProcessor) so với 4 class cũ
+
+Class cũ được lấy nguyên văn từ git (commit trước khi có product_data_processor.py),
+dữ liệu đầu vào dựng từ cache.json đi kèm repo:
+  - điện thoại: dùng trực tiếp cache.json ({url: {data, timestamp}})
+  - laptop/máy tính bảng/đồng hồ: bọc cache.json thành {"data": {"products": [...]}}
+Với mỗi danh mục, đo extract + process (lấy lần nhanh nhất), kiểm tra kết quả
+giống hệt nhau và trả về mã lỗi 1 nếu engine mới chậm hơn class cũ.
+Micro-benchmark clean_price_data chạy trên mọi chuỗi giá trong dữ liệu đi kèm.
+
+Chạy: python python/bench_processors.py [--repeat 9] [--scale 5] [--legacy-ref REF]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from laptop_data_processor import LaptopDataProcessor
+from product_data_processor import parse_price
+from phone_data_processor import PhoneDataProcessor
+from smartwatch_data_processor import SmartwatchDataProcessor
+from tablet_data_processor import TabletDataProcessor
+
+# (danh mục, class mới, tên class cũ, định dạng đầu vào)
+CATEGORIES = [
+    ('phone', PhoneDataProcessor, 'PhoneDataProcessor', 'cache'),
+    ('laptop', LaptopDataProcessor, 'LaptopDataProcessor', 'listing'),
+    ('tablet', TabletDataProcessor, 'TabletDataProcessor', 'listing'),
+    ('smartwatch', SmartwatchDataProcessor, 'SmartwatchDataProcessor', 'listing'),
+]
+
+
+def git(*args: str) -> str:
+    return subprocess.run(
+        ['git', *args], cwd=REPO_DIR, check=True, capture_output=True, text=True, encoding='utf-8'
+    ).stdout
+
+
+def default_legacy_ref() -> str:
+    """Commit cha của commit đã thêm product_data_processor.py"""
+    commits = git('log', '--diff-filter=A', '--format=%H', '--', 'python/product_data_processor.py').split()
+    return f"{commits[-1]}^" if commits else 'HEAD'
+
+
+def load_legacy_class(ref: str, category: str, class_name: str) -> type:
+    source = git('show', f"{ref}:python/{category}_data_processor.py")
+    module = types.ModuleType(f"legacy_{category}_data_processor")
+    exec(compile(source, f"{ref}:{category}_data_processor.py", 'exec'), module.__dict__)
+    return getattr(module, class_name)
+
+
+def perturb_price(price: str, rng: random.Random) -> str:
+    """Giá lệch ngẫu nhiên ±20% (làm tròn chục nghìn), giữ định dạng 5.890.000₫"""
+    value = parse_price(price) if price else 0
+    if not value:
+        return price
+    value = max(10000, round(value * rng.uniform(0.8, 1.2), -4))
+    return f"{value:,.0f}₫".replace(',', '.')
+
+
+def perturb_entry(value: Dict[str, Any], copy: int, rng: random.Random) -> Dict[str, Any]:
+    """Bản sao của một mục cache.json với title và giá khác đi (thông số, ảnh dùng chung)"""
+    detail = dict(value.get('data', {}))
+    if detail.get('title'):
+        detail['title'] = f"{detail['title']} #{copy}"
+    for field in ('price', 'priceOld'):
+        if detail.get(field):
+            detail[field] = perturb_price(detail[field], rng)
+    return {**value, 'data': detail}
+
+
+def build_inputs(scale: int, seed: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Dữ liệu đầu vào cho 2 định dạng, nhân bản `scale` lần
+
+    Có `seed` thì từ bản sao thứ 2 trở đi title và giá được làm lệch ngẫu
+    nhiên (cố định theo seed), để dữ liệu lớn không chỉ là các giá trị lặp lại.
+    """
+    with open(os.path.join(REPO_DIR, 'cache.json'), 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+
+    rng = random.Random(seed)
+    cache_input = {}
+    products = []
+    for copy in range(scale):
+        for key, value in cache.items():
+            if seed is not None and copy:
+                value = perturb_entry(value, copy, rng)
+            cache_input[f"{key}_{copy}"] = value
+            detail = value.get('data', {})
+            title = detail.get('title', '')
+            products.append({
+                'name': title,
+                'brand': title.split()[0] if title else '',
+                'price': detail.get('price', ''),
+                'priceOld': detail.get('priceOld', ''),
+                'discount': '',
+                'image': (detail.get('images') or [''])[0],
+                'color': '',
+                'detail': detail,
+            })
+
+    listing_input = {
+        'success': True,
+        'message': 'benchmark',
+        'data': {'total': len(products), 'products': products},
+    }
+    return {'cache': cache_input, 'listing': listing_input}
+
+
+# Các dạng giá hiếm gặp trong dữ liệu crawl
+PRICE_EDGE_CASES = [
+    '', 'Liên hệ', '5.890.000₫', '5.890.000₫ - 6.490.000₫', 'Từ 12.990.000₫',
+    '1,290,000₫', 'Giá: 990.000 ₫', '₫', '0₫',
+]
+
+
+def collect_prices(scale: int) -> List[str]:
+    """Mọi chuỗi price/priceOld trong cache.json và processed_*.json"""
+    prices = list(PRICE_EDGE_CASES)
+    with open(os.path.join(REPO_DIR, 'cache.json'), 'r', encoding='utf-8') as f:
+        for value in json.load(f).values():
+            detail = value.get('data', {})
+            prices += [detail.get('price', ''), detail.get('priceOld', '')]
+
+    for folder in (REPO_DIR, os.path.join(REPO_DIR, 'data')):
+        for name in sorted(os.listdir(folder)):
+            if name.startswith('processed_') and name.endswith('.json'):
+                with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+                    for product in json.load(f):
+                        for field in ('price', 'priceOld'):
+                            value = product.get(field)
+                            if isinstance(value, dict):
+                                prices.append(value.get('value', ''))
+    return prices * scale
+
+
+def run_pipeline(processor: Any, category: str, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """extract + process theo tên method của class (class cũ không có extract_records)"""
+    extract = getattr(processor, f"extract_{category}_data")
+    process = getattr(processor, f"process_{category}_data")
+    return process(extract(raw_data))
+
+
+def best_times(funcs: List[Callable[[], Any]], repeat: int) -> List[float]:
+    """Thời gian nhanh nhất của từng hàm, chạy xen kẽ để nhiễu ảnh hưởng đều cả hai"""
+    best = [float('inf')] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            gc.collect()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                func()
+            best[i] = min(best[i], time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="So sánh engine hợp nhất với các class processor cũ")
+    parser.add_argument('--repeat', type=int, default=9, help="Số lần đo cho mỗi danh mục")
+    parser.add_argument('--scale', type=int, default=5, help="Nhân bản dữ liệu cache.json N lần")
+    parser.add_argument('--legacy-ref', default=None, help="Git ref chứa các class cũ")
+    parser.add_argument('--tolerance', type=float, default=0.05, help="Sai số cho phép khi so sánh thời gian")
+    args = parser.parse_args(argv)
+
+    legacy_ref = args.legacy_ref or default_legacy_ref()
+    inputs = build_inputs(args.scale)
+    print(f"📦 Class cũ: {legacy_ref} | repeat={args.repeat} | scale={args.scale}")
+    print(f"{'Danh mục':<12}{'Bản ghi':>9}{'Cũ (ms)':>11}{'Mới (ms)':>11}{'Tỉ lệ':>8}  Kết quả")
+
+    failed = False
+    for category, new_class, class_name, input_format in CATEGORIES:
+        legacy = load_legacy_class(legacy_ref, category, class_name)()
+        unified = new_class()
+        raw_data = inputs[input_format]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy_output = run_pipeline(legacy, category, raw_data)
+            unified_output = run_pipeline(unified, category, raw_data)
+        same = legacy_output == unified_output
+
+        legacy_time, unified_time = best_times([
+            lambda: run_pipeline(legacy, category, raw_data),
+            lambda: run_pipeline(unified, category, raw_data),
+        ], args.repeat)
+        ratio = unified_time / legacy_time if legacy_time else 0.0
+        ok = same and ratio <= 1 + args.tolerance
+        failed = failed or not ok
+
+        status = '✅' if ok else ('❌ khác kết quả' if not same else '❌ chậm hơn')
+        print(f"{category:<12}{len(unified_output):>9}{legacy_time * 1000:>11.1f}{unified_time * 1000:>11.1f}{ratio:>8.2f}  {status}")
+
+    # Micro-benchmark giá: bộ nhớ đệm được xóa ở đầu mỗi lần đo
+    prices = collect_prices(args.scale)
+    legacy_price = load_legacy_class(legacy_ref, 'phone', 'PhoneDataProcessor')().clean_price_data
+    unified_price = PhoneDataProcessor().clean_price_data
+    same = [legacy_price(p) for p in prices] == [unified_price(p) for p in prices]
+    legacy_time, unified_time = best_times([
+        lambda: [legacy_price(p) for p in prices],
+        lambda: (parse_price.cache_clear(), [unified_price(p) for p in prices]),
+    ], args.repeat)
+    ratio = unified_time / legacy_time if legacy_time else 0.0
+    ok = same and ratio <= 1 + args.tolerance
+    failed = failed or not ok
+    status = '✅' if ok else ('❌ khác kết quả' if not same else '❌ chậm hơn')
+    cache = parse_price.cache_info()
+    print(f"{'price':<12}{len(prices):>9}{legacy_time * 1000:>11.1f}{unified_time * 1000:>11.1f}{ratio:>8.2f}  {status}"
+          f" (cache {cache.currsize} giá khác nhau)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phân tích catalog đã xử lý (processed_*.json) dạng cột NumPy
+
+Catalog được chuyển một lần thành các mảng cột (giá, giá cũ, % giảm giá, số
+hình/màu/thông số, mã danh mục, mã brand); các thống kê nhóm như phân vị giá
+theo brand, phân bố giảm giá, histogram đều tính bằng phép toán vector thay
+vì lặp qua từng dict. Bổ sung cho generate_summary_report.
+
+NumPy là phụ thuộc tùy chọn: chỉ cần khi dùng module này (pip install numpy).
+
+Chạy: python python/catalog_analytics.py [processed_phones_data.json ...] [--top 10] [--json báo_cáo.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là tùy chọn, chỉ báo lỗi khi thật sự dùng
+    np = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DISCOUNT_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)\s*%')
+# Ngưỡng (%) của phân bố giảm giá, giá trị ngoài khoảng được đếm vào 'below'/'above'
+DISCOUNT_BINS = (0, 5, 10, 15, 20, 30, 50, 100)
+# Tiền tố loại sản phẩm đứng trước brand trong tên ("Điện thoại iPhone 17" -> "iPhone")
+NAME_PREFIXES = ('điện thoại', 'máy tính bảng', 'đồng hồ thông minh', 'đồng hồ', 'laptop')
+PRICE_QUANTILES = (25, 50, 75)
+HISTOGRAM_BINS = 10
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Chế độ phân tích cần NumPy: pip install numpy")
+
+
+def parse_discount(label: Any) -> float:
+    """'-10%' -> 10.0, không có thì 0"""
+    match = DISCOUNT_PATTERN.search(label) if isinstance(label, str) else None
+    return float(match.group(1).replace(',', '.')) if match else 0.0
+
+
+def category_from_path(path: str) -> str:
+    """processed_phones_data.json -> phones"""
+    name = os.path.basename(path)
+    if name.startswith('processed_') and name.endswith('_data.json'):
+        return name[len('processed_'):-len('_data.json')]
+    return os.path.splitext(name)[0]
+
+
+def product_brand(record: Dict[str, Any]) -> str:
+    """Trường brand, nếu thiếu (processed phones chỉ có title) thì lấy từ đầu tiên của tên như upload_data"""
+    brand = record.get('brand')
+    if brand:
+        return brand
+    name = (record.get('name') or record.get('title') or '').strip()
+    lowered = name.lower()
+    for prefix in NAME_PREFIXES:
+        if lowered.startswith(prefix + ' '):
+            name = name[len(prefix):]
+            break
+    parts = name.split()
+    return parts[0] if parts else ''
+
+
+def _numeric(value: Any) -> int:
+    return value.get('numeric', 0) or 0 if isinstance(value, dict) else 0
+
+
+class CatalogColumns:
+    """Catalog đã xử lý ở dạng cột, mỗi thuộc tính là một mảng NumPy cùng độ dài"""
+
+    def __init__(self, records: Sequence[Dict[str, Any]], categories: Optional[Sequence[str]] = None):
+        require_numpy()
+        size = len(records)
+        self.size = size
+        self.price = np.fromiter((_numeric(r.get('price')) for r in records), dtype=np.int64, count=size)
+        self.price_old = np.fromiter((_numeric(r.get('priceOld')) for r in records), dtype=np.int64, count=size)
+        summaries = [r.get('summary', {}) for r in records]
+        self.image_count = np.fromiter((s.get('imageCount', 0) for s in summaries), dtype=np.int32, count=size)
+        self.color_count = np.fromiter((s.get('colorCount', 0) for s in summaries), dtype=np.int32, count=size)
+        self.spec_count = np.fromiter((s.get('specCount', 0) for s in summaries), dtype=np.int32, count=size)
+
+        # % giảm giá: tính từ giá cũ/giá mới, nếu thiếu giá cũ thì lấy từ nhãn "-10%"
+        labels = np.fromiter((parse_discount(r.get('discount')) for r in records), dtype=np.float64, count=size)
+        has_old = (self.price_old > self.price) & (self.price > 0)
+        from_price = np.zeros(size)
+        np.divide(self.price_old - self.price, self.price_old, out=from_price, where=has_old)
+        self.discount = np.where(has_old, from_price * 100, labels)
+
+        brands = [product_brand(r) for r in records]
+        self.brand_names, self.brand_codes = np.unique(np.array(brands, dtype=object), return_inverse=True)
+        categories = categories if categories is not None else [''] * size
+        self.category_names, self.category_codes = np.unique(np.array(categories, dtype=object), return_inverse=True)
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]) -> 'CatalogColumns':
+        """Ghép nhiều file processed_*.json, danh mục lấy từ tên file"""
+        records: List[Dict[str, Any]] = []
+        categories: List[str] = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            records.extend(data)
+            categories.extend([category_from_path(path)] * len(data))
+        return cls(records, categories)
+
+    @property
+    def priced(self) -> 'np.ndarray':
+        return self.price > 0
+
+    @property
+    def brand_missing(self) -> int:
+        """Số sản phẩm có giá nhưng không xác định được brand (không có trong phân vị theo brand)"""
+        return int((self.priced & (self.brand_names[self.brand_codes] == '')).sum())
+
+    def price_stats(self) -> Dict[str, Any]:
+        prices = self.price[self.priced]
+        if not prices.size:
+            return {'count': 0}
+        quantiles = np.percentile(prices, PRICE_QUANTILES)
+        return {
+            'count': int(prices.size),
+            'min': int(prices.min()),
+            'max': int(prices.max()),
+            'mean': float(prices.mean()),
+            'std': float(prices.std()),
+            **{f"p{q}": float(v) for q, v in zip(PRICE_QUANTILES, quantiles)},
+        }
+
+    def _grouped(self, codes: 'np.ndarray', names: 'np.ndarray', values: 'np.ndarray', mask: 'np.ndarray') -> List[Tuple[str, 'np.ndarray']]:
+        """Giá trị đã sắp xếp của từng nhóm (một lần lexsort rồi cắt mảng)"""
+        codes, values = codes[mask], values[mask]
+        order = np.lexsort((values, codes))
+        codes, values = codes[order], values[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        return [(names[group[0]], part) for group, part in zip(np.split(codes, bounds), np.split(values, bounds)) if part.size]
+
+    def brand_price_quantiles(self, quantiles: Sequence[float] = PRICE_QUANTILES, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Phân vị giá theo brand, brand nhiều sản phẩm có giá nhất lên đầu"""
+        mask = self.priced & (self.brand_names[self.brand_codes] != '')
+        rows = []
+        for brand, prices in self._grouped(self.brand_codes, self.brand_names, self.price, mask):
+            values = np.percentile(prices, quantiles)
+            rows.append({
+                'brand': brand,
+                'count': int(prices.size),
+                'min': int(prices[0]),
+                'max': int(prices[-1]),
+                **{f"p{q:g}": float(v) for q, v in zip(quantiles, values)},
+            })
+        rows.sort(key=lambda row: (-row['count'], row['brand']))
+        return rows[:top] if top else rows
+
+    def category_summary(self) -> List[Dict[str, Any]]:
+        """Số sản phẩm, giá trung bình, số hình/màu/thông số trung bình theo danh mục"""
+        k = len(self.category_names)
+        counts = np.bincount(self.category_codes, minlength=k)
+        priced = np.bincount(self.category_codes, weights=self.priced, minlength=k)
+        price_sum = np.bincount(self.category_codes, weights=self.price * self.priced, minlength=k)
+        discounted = np.bincount(self.category_codes, weights=self.discount > 0, minlength=k)
+        means = {
+            name: np.bincount(self.category_codes, weights=column, minlength=k) / np.maximum(counts, 1)
+            for name, column in (('avgImages', self.image_count), ('avgColors', self.color_count), ('avgSpecs', self.spec_count))
+        }
+        return [
+            {
+                'category': self.category_names[i],
+                'count': int(counts[i]),
+                'avgPrice': float(price_sum[i] / priced[i]) if priced[i] else 0.0,
+                'discountedPercent': float(discounted[i] / counts[i] * 100) if counts[i] else 0.0,
+                **{name: float(values[i]) for name, values in means.items()},
+            }
+            for i in range(k)
+        ]
+
+    def discount_distribution(self, bins: Sequence[float] = DISCOUNT_BINS) -> Dict[str, Any]:
+        """Số sản phẩm không giảm giá và số sản phẩm theo từng khoảng % giảm giá
+
+        np.histogram bỏ qua giá trị ngoài [bins[0], bins[-1]] nên các giá trị đó
+        (giá tăng, nhãn lỗi trên 100%) được đếm riêng vào 'below'/'above';
+        tổng bins + below + above luôn bằng 'discounted'.
+        """
+        discounted = self.discount[self.discount != 0]
+        counts, edges = np.histogram(discounted, bins=bins)
+        positive = discounted[discounted > 0]
+        return {
+            'none': int(self.size - discounted.size),
+            'discounted': int(discounted.size),
+            'mean': float(positive.mean()) if positive.size else 0.0,
+            'below': int((discounted < edges[0]).sum()),
+            'above': int((discounted > edges[-1]).sum()),
+            'bins': [{'from': float(lo), 'to': float(hi), 'count': int(n)} for lo, hi, n in zip(edges[:-1], edges[1:], counts)],
+        }
+
+    def histogram(self, column: str, bins: int = HISTOGRAM_BINS) -> List[Dict[str, Any]]:
+        """Histogram của một cột (price chỉ tính sản phẩm có giá)"""
+        values = getattr(self, column)
+        if column == 'price':
+            values = values[self.priced]
+        if not values.size:
+            return []
+        counts, edges = np.histogram(values, bins=bins)
+        return [{'from': float(lo), 'to': float(hi), 'count': int(n)} for lo, hi, n in zip(edges[:-1], edges[1:], counts)]
+
+    def report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            'total': self.size,
+            'priceStats': self.price_stats(),
+            'categories': self.category_summary(),
+            'brandPrices': self.brand_price_quantiles(top=top),
+            'brandMissing': self.brand_missing,
+            'discounts': self.discount_distribution(),
+            'histograms': {column: self.histogram(column) for column in ('price', 'image_count', 'color_count', 'spec_count')},
+        }
+
+
+def find_processed_files() -> List[str]:
+    """processed_*.json ở thư mục gốc và data/ (file trùng tên lấy bản ở data/)"""
+    found: Dict[str, str] = {}
+    for folder in (REPO_DIR, os.path.join(REPO_DIR, 'data')):
+        for path in sorted(glob.glob(os.path.join(folder, 'processed_*.json'))):
+            found[os.path.basename(path)] = path
+    return list(found.values())
+
+
+def print_report(report: Dict[str, Any]):
+    price = report['priceStats']
+    print(f"\n📊 PHÂN TÍCH CATALOG: {report['total']} sản phẩm")
+    if price['count']:
+        print(f"   💰 Giá: {price['min']:,}₫ - {price['max']:,}₫, trung bình {price['mean']:,.0f}₫, "
+              f"trung vị {price['p50']:,.0f}₫")
+
+    print("\n📁 Theo danh mục:")
+    for row in report['categories']:
+        print(f"   {row['category']:<14} {row['count']:>5} sp  giá TB {row['avgPrice']:>14,.0f}₫  "
+              f"giảm giá {row['discountedPercent']:5.1f}%  hình {row['avgImages']:5.1f}  màu {row['avgColors']:4.1f}")
+
+    print("\n🏷️ Giá theo brand (p25 / p50 / p75):")
+    for row in report['brandPrices']:
+        print(f"   {row['brand']:<14} {row['count']:>5} sp  {row['p25']:>14,.0f}  {row['p50']:>14,.0f}  {row['p75']:>14,.0f}")
+    if report['brandMissing']:
+        print(f"   ⚠️ {report['brandMissing']} sản phẩm không xác định được brand (không tính)")
+
+    discounts = report['discounts']
+    print(f"\n🎯 Giảm giá: {discounts['none']} sản phẩm không giảm, trung bình {discounts['mean']:.1f}% khi có giảm")
+    bins = discounts['bins']
+    if discounts['below']:
+        print(f"   {'<':>4} {bins[0]['from']:>3.0f}%      : {discounts['below']}")
+    for row in bins:
+        print(f"   {row['from']:>4.0f}% - {row['to']:>3.0f}%: {row['count']}")
+    if discounts['above']:
+        print(f"   {'>':>4} {bins[-1]['to']:>3.0f}%      : {discounts['above']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Phân tích processed_*.json bằng NumPy")
+    parser.add_argument('files', nargs='*', help="Các file processed_*.json (mặc định: tự tìm trong repo)")
+    parser.add_argument('--top', type=int, default=10, help="Số brand hiển thị (0 = tất cả)")
+    parser.add_argument('--json', metavar='FILE', help="Ghi báo cáo đầy đủ ra file JSON")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("❌ Chế độ phân tích cần NumPy: pip install numpy")
+        return 1
+    files = args.files or find_processed_files()
+    if not files:
+        print("❌ Không tìm thấy file processed_*.json")
+        return 1
+
+    columns = CatalogColumns.from_files(files)
+    report = columns.report(top=args.top or None)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Đã lưu báo cáo: {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,879 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Engine xử lý dữ liệu sản phẩm dùng chung cho mọi danh mục
+(điện thoại, laptop, máy tính bảng, đồng hồ thông minh)
+
+ProductDataProcessor chứa toàn bộ phần chung: menu, đọc/ghi file, làm sạch
+giá, xử lý thông số/màu/hình ảnh, CSV. Mỗi danh mục chỉ khai báo nhãn, đường
+dẫn file và "adapter" đầu vào:
+  - extract_records: trích xuất bản ghi thô từ file JSON đầu vào
+  - process_record: chuyển một bản ghi thô thành bản ghi đã xử lý
+  - csv_row: một dòng CSV từ bản ghi thô
+ListingDataProcessor là adapter cho dữ liệu dạng {"data": {"products": [...]}}
+(laptop, máy tính bảng, đồng hồ thông minh).
+"""
+
+import argparse
+import json
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+import re
+
+from product_stats import ProductStats
+from profiling import SectionProfiler
+from run_metrics import StageRecorder, peak_rss_mb
+
+HEX_COLOR_PATTERN = re.compile(r'#[0-9A-Fa-f]{6}')
+# Giá: đoạn số đầu tiên kèm dấu phân cách và ký hiệu ₫, ví dụ "5.890.000₫"
+PRICE_PATTERN = re.compile(r'\d[\d.,₫]*')
+PRICE_SEPARATORS = str.maketrans('', '', '.,₫')
+PRICE_CACHE_SIZE = 4096
+PRODUCT_IMAGE_KEYWORDS = ('-1-', '-2-', '-3-', '-4-', '-5-')
+PRODUCT_IMAGE_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in PRODUCT_IMAGE_KEYWORDS))
+# Mỗi tiến trình nhận khoảng CHUNKS_PER_WORKER phần để chia tải đều hơn
+CHUNKS_PER_WORKER = 4
+
+
+@lru_cache(maxsize=PRICE_CACHE_SIZE)
+def parse_price(price_str: str) -> int:
+    """Giá trị số của chuỗi giá trong một lần quét
+
+    "5.890.000₫" -> 5890000, khoảng giá "5.890.000₫ - 6.490.000₫" lấy giá
+    đầu tiên, chuỗi không có số như "Liên hệ" -> 0.
+    """
+    match = PRICE_PATTERN.search(price_str)
+    return int(match.group(0).translate(PRICE_SEPARATORS)) if match else 0
+
+
+def get_process_workers() -> int:
+    """Số tiến trình xử lý lấy từ PROCESS_WORKERS, mặc định 1 (tuần tự)"""
+    env_val = os.getenv('PROCESS_WORKERS')
+    if env_val and env_val.isdigit() and int(env_val) > 0:
+        return int(env_val)
+    return 1
+
+
+def get_trace_memory() -> bool:
+    """Bật tracemalloc khi đo từng bước nếu PROCESS_TRACE_MEMORY=1"""
+    return os.getenv('PROCESS_TRACE_MEMORY', '').lower() in ('1', 'true', 'yes')
+
+
+def _process_chunk(processor_class: type, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Chạy trong tiến trình con: xử lý tuần tự một phần danh sách"""
+    return processor_class()._process_serial(records)
+
+
+# Lệnh CLI -> chức năng tương ứng trong menu
+COMMANDS = {
+    'extract': ('option_1_simple_extract', "Trích xuất dữ liệu đơn giản"),
+    'process': ('option_2_advanced_process', "Xử lý dữ liệu đầy đủ"),
+    'csv': ('option_3_create_csv', "Tạo file CSV"),
+    'all': ('option_4_run_all', "Chạy tất cả (extract + process + csv)"),
+    'stats': ('option_5_quick_stats', "Xem thống kê nhanh"),
+}
+
+# Tham số đường dẫn -> thuộc tính của processor
+PATH_OPTIONS = {
+    'input': 'input_file',
+    'extracted': 'extracted_file',
+    'processed': 'processed_file',
+    'report': 'report_file',
+    'csv_file': 'csv_file',
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Xử lý dữ liệu sản phẩm. Không có lệnh: mở menu tương tác."
+    )
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Số tiến trình xử lý song song (mặc định: PROCESS_WORKERS hoặc 1)")
+    parser.add_argument('--input', help="File JSON đầu vào")
+    parser.add_argument('--extracted', help="File JSON trích xuất")
+    parser.add_argument('--processed', help="File JSON đã xử lý")
+    parser.add_argument('--report', help="File báo cáo")
+    parser.add_argument('--csv-file', help="File CSV")
+    parser.add_argument('--timing', metavar='FILE',
+                        help="Ghi thời gian từng bước dạng JSON ra FILE ('-' để in ra stderr)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Đo bộ nhớ Python đỉnh từng bước bằng tracemalloc (chậm hơn, mặc định: PROCESS_TRACE_MEMORY)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="Profile bằng cProfile, ghi FILE (.pstats) và FILE.txt (mặc định: PROCESS_PROFILE)")
+    parser.add_argument('--profile-stage', metavar='STAGE',
+                        help="Chỉ profile một bước: load, extract, save_extracted, process, save_processed, csv, stats "
+                             "(mặc định: PROCESS_PROFILE_STAGE hoặc cả lệnh)")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text)
+    return parser.parse_args(argv)
+
+
+def write_timing(path: str, timing: Dict[str, Any]):
+    """Ghi kết quả đo thời gian ra file hoặc stderr ('-')
+
+    stdout đã có các dòng tiến độ nên JSON đi ra stderr để tách riêng được (2> timing.json).
+    """
+    text = json.dumps(timing, ensure_ascii=False, indent=2)
+    if path == '-':
+        print(text, file=sys.stderr)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+
+def run_cli(processor: 'ProductDataProcessor', argv: Optional[List[str]] = None) -> int:
+    """Entry point dòng lệnh: chạy một lệnh rồi thoát, trả về exit status"""
+    args = parse_args(argv)
+    if args.workers:
+        processor.workers = args.workers
+    for option, attr in PATH_OPTIONS.items():
+        value = getattr(args, option)
+        if value:
+            setattr(processor, attr, value)
+    if args.trace_memory:
+        processor.recorder.trace_memory = True
+    profile_path = args.profile or os.getenv('PROCESS_PROFILE')
+    if profile_path:
+        # Có --trace-memory thì tóm tắt profile kèm các dòng cấp phát nhiều bộ nhớ nhất
+        processor.profiler = SectionProfiler(profile_path, trace_memory=processor.recorder.trace_memory)
+        processor.profile_stage = args.profile_stage or os.getenv('PROCESS_PROFILE_STAGE') or None
+
+    if not args.command:
+        processor.run()
+        return 0
+
+    ok, total = processor.run_command(args.command)
+
+    if args.timing:
+        write_timing(args.timing, {
+            'category': processor.menu_title.lower(),
+            'command': args.command,
+            'ok': ok,
+            'workers': processor.workers,
+            'stages': {name: round(seconds, 6) for name, seconds in processor.recorder.timings.items()},
+            'total': round(total, 6),
+        })
+    return 0 if ok else 1
+
+
+class ProductDataProcessor:
+    """Class cơ sở xử lý dữ liệu sản phẩm, lớp con khai báo nhãn và adapter"""
+
+    # Nhãn hiển thị - lớp con ghi đè
+    icon = '📦'
+    menu_title = 'PRODUCT'
+    # Chèn vào tiêu đề các chức năng, ví dụ "DỮ LIỆU LAPTOP ĐƠN GIẢN"
+    heading_label = ''
+    # Đơn vị đếm, ví dụ "Đã trích xuất 10 laptop"
+    count_label = 'sản phẩm'
+
+    def __init__(self):
+        self.input_file = 'products.json'
+        self.extracted_file = 'products_extracted.json'
+        self.processed_file = 'processed_products_data.json'
+        self.report_file = 'products_summary_report.json'
+        self.csv_file = 'products_data.csv'
+        self.workers = get_process_workers()
+        # Thời gian, tốc độ và bộ nhớ từng bước của lệnh đang chạy
+        self.recorder = StageRecorder(get_trace_memory())
+        # cProfile cho cả lệnh, hoặc chỉ bước profile_stage (bật bằng --profile)
+        self.profiler: Optional[SectionProfiler] = None
+        self.profile_stage: Optional[str] = None
+        # Bản ghi đã trích xuất trong phiên: ((đường dẫn, mtime, size), records)
+        self._records_cache: Optional[Tuple[Tuple[str, int, int], List[Dict[str, Any]]]] = None
+        # Thống kê của lần process_records gần nhất, tính ngay trong lúc xử lý
+        self.processed_stats: Optional[ProductStats] = None
+
+    @property
+    def _heading(self) -> str:
+        return f" {self.heading_label}" if self.heading_label else ''
+
+    def display_menu(self):
+        """Hiển thị menu lựa chọn"""
+        print("\n" + "="*60)
+        print(f"{self.icon} {self.menu_title} DATA PROCESSOR - MENU CHÍNH")
+        print("="*60)
+        print("1. 🔍 Trích xuất dữ liệu đơn giản")
+        print("2. ⚙️  Xử lý dữ liệu đầy đủ (nâng cao)")
+        print("3. 📊 Tạo file CSV")
+        print("4. 🚀 Chạy tất cả (1+2+3)")
+        print("5. 📈 Xem thống kê nhanh")
+        print("6. ⚙️  Cài đặt")
+        print("0. ❌ Thoát")
+        print("="*60)
+
+    def get_user_choice(self) -> int:
+        """Lấy lựa chọn từ người dùng"""
+        while True:
+            try:
+                choice = int(input("\n🎯 Chọn chức năng (0-6): "))
+                if 0 <= choice <= 6:
+                    return choice
+                else:
+                    print("❌ Vui lòng chọn từ 0-6")
+            except ValueError:
+                print("❌ Vui lòng nhập số hợp lệ")
+
+    def check_input_file(self) -> bool:
+        """Kiểm tra file đầu vào"""
+        if not os.path.exists(self.input_file):
+            print(f"❌ Không tìm thấy file: {self.input_file}")
+            return False
+        return True
+
+    def load_json_data(self) -> Dict[str, Any]:
+        """Đọc dữ liệu JSON từ file"""
+        try:
+            with open(self.input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            print(f"✅ Đã đọc file: {self.input_file}")
+
+            # Debug: Kiểm tra cấu trúc dữ liệu
+            if isinstance(data, dict):
+                self.describe_raw_data(data)
+            else:
+                print(f"⚠️ Dữ liệu không phải dict: {type(data)}")
+
+            return data
+        except Exception as e:
+            print(f"❌ Lỗi đọc file: {e}")
+            return {}
+
+    # ------------------------------------------------------------------
+    # Adapter đầu vào - lớp con cài đặt
+    # ------------------------------------------------------------------
+
+    def describe_raw_data(self, data: Dict[str, Any]):
+        """In cấu trúc dữ liệu thô để debug"""
+        print(f"📊 Tổng số keys: {len(data)}")
+
+    def extract_records(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Trích xuất danh sách bản ghi thô từ JSON"""
+        raise NotImplementedError
+
+    def process_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Xử lý một bản ghi thô"""
+        raise NotImplementedError
+
+    def csv_row(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Một dòng CSV từ bản ghi thô"""
+        raise NotImplementedError
+
+    def print_quick_stats(self, records: List[Dict[str, Any]]):
+        """In thống kê nhanh"""
+        raise NotImplementedError
+
+    def print_quick_stats_from_processed(self, processed_data: List[Dict[str, Any]], stats: Optional[ProductStats] = None):
+        """In thống kê nhanh từ dữ liệu đã xử lý (stats: số liệu đã tính sẵn, nếu có)"""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Xử lý dùng chung
+    # ------------------------------------------------------------------
+
+    def clean_price_data(self, price_str: str) -> Dict[str, Any]:
+        """Làm sạch dữ liệu giá"""
+        if not price_str:
+            return {'value': '', 'currency': '', 'numeric': 0}
+
+        return {
+            'value': price_str,
+            'currency': '₫',
+            'numeric': parse_price(price_str)
+        }
+
+    def process_specifications(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Xử lý thông số kỹ thuật"""
+        processed_specs = []
+
+        for spec in specs:
+            processed_items = [
+                {
+                    'label': item.get('label', '').replace(':', '').strip(),
+                    'value': value,
+                    'type': 'array' if isinstance(value, list) else 'string'
+                }
+                for item in spec.get('items', [])
+                for value in (item.get('value', ''),)
+            ]
+
+            processed_specs.append({
+                'category': spec.get('category', ''),
+                'items': processed_items,
+                'itemCount': len(processed_items)
+            })
+
+        return processed_specs
+
+    def process_color_options(self, color_options: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Xử lý tùy chọn màu sắc"""
+        processed_colors = []
+
+        for color in color_options:
+            color_style = color.get('colorStyle', '')
+            processed_colors.append({
+                'name': color.get('name', ''),
+                'isActive': color.get('isActive', False),
+                'colorCode': color.get('colorCode', ''),
+                'productCode': color.get('productCode', ''),
+                'colorStyle': color_style,
+                'hexColor': self.extract_hex_color(color_style)
+            })
+
+        return processed_colors
+
+    def extract_hex_color(self, color_style: str) -> str:
+        """Trích xuất mã màu hex từ CSS style"""
+        if not color_style:
+            return ''
+
+        hex_match = HEX_COLOR_PATTERN.search(color_style)
+        if hex_match:
+            return hex_match.group(0)
+
+        return ''
+
+    def process_images(self, images: List[str]) -> Dict[str, Any]:
+        """Xử lý danh sách hình ảnh"""
+        if not images:
+            return {'count': 0, 'urls': [], 'categories': {}}
+
+        slider, product, kit, other = [], [], [], []
+
+        for img_url in images:
+            if 'Slider' in img_url:
+                slider.append(img_url)
+            elif 'Kit' in img_url:
+                kit.append(img_url)
+            elif PRODUCT_IMAGE_PATTERN.search(img_url):
+                product.append(img_url)
+            else:
+                other.append(img_url)
+
+        return {
+            'count': len(images),
+            'urls': images,
+            'categories': {
+                'slider': slider,
+                'product': product,
+                'kit': kit,
+                'other': other
+            }
+        }
+
+    def format_timestamp(self, timestamp: str) -> Dict[str, Any]:
+        """Định dạng timestamp"""
+        if not timestamp:
+            return {'raw': '', 'formatted': '', 'date': '', 'time': ''}
+
+        try:
+            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+            return {
+                'raw': timestamp,
+                'formatted': dt.strftime('%d/%m/%Y %H:%M:%S'),
+                'date': dt.strftime('%d/%m/%Y'),
+                'time': dt.strftime('%H:%M:%S'),
+                'year': dt.year,
+                'month': dt.month,
+                'day': dt.day
+            }
+        except (ValueError, TypeError, AttributeError):
+            return {'raw': timestamp, 'formatted': '', 'date': '', 'time': ''}
+
+    def _process_serial(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        process_record = self.process_record
+        return [process_record(record) for record in records]
+
+    def process_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Xử lý toàn bộ bản ghi
+
+        Với workers > 1, danh sách được chia thành nhiều phần xử lý trên
+        process pool rồi ghép lại theo đúng thứ tự ban đầu (kết quả giống
+        hệt chạy tuần tự).
+        Thống kê (self.processed_stats) được cập nhật ngay khi từng bản ghi
+        xử lý xong, không cần duyệt lại kết quả.
+        """
+        stats = self.processed_stats = ProductStats()
+        workers = min(self.workers, len(records))
+        if workers <= 1:
+            process_record = self.process_record
+            processed = []
+            for record in records:
+                item = process_record(record)
+                stats.add(item)
+                processed.append(item)
+            return processed
+
+        chunk_size = -(-len(records) // (workers * CHUNKS_PER_WORKER))
+        chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+        print(f"⚡ Xử lý song song {len(records)} {self.count_label} với {workers} tiến trình ({len(chunks)} phần)")
+
+        processed = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_process_chunk, [type(self)] * len(chunks), chunks):
+                stats.update(result)
+                processed.extend(result)
+        return processed
+
+    def save_json_data(self, data: Any, filename: str) -> bool:
+        """Lưu dữ liệu JSON"""
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            print(f"✅ Đã lưu: {filename}")
+            return True
+        except Exception as e:
+            print(f"❌ Lỗi lưu {filename}: {e}")
+            return False
+
+    def save_csv_data(self, records: List[Dict[str, Any]]) -> bool:
+        """Lưu dữ liệu CSV"""
+        try:
+            csv_data = [self.csv_row(record) for record in records]
+
+            with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
+                if csv_data:
+                    writer = csv.DictWriter(f, fieldnames=csv_data[0].keys())
+                    writer.writeheader()
+                    writer.writerows(csv_data)
+
+            print(f"✅ Đã tạo CSV: {self.csv_file}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Lỗi tạo CSV: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Các chức năng của menu
+    # ------------------------------------------------------------------
+
+    def _input_signature(self) -> Tuple[str, int, int]:
+        """Khóa cache của file đầu vào: đường dẫn tuyệt đối, mtime, kích thước"""
+        stat = os.stat(self.input_file)
+        return (os.path.abspath(self.input_file), stat.st_mtime_ns, stat.st_size)
+
+    @contextmanager
+    def _stage(self, name: str, records: Optional[int] = None):
+        """Đo một bước (thời gian, bản ghi/giây, bộ nhớ đỉnh) vào self.recorder
+
+        Bước trùng profile_stage được profile riêng.
+        """
+        with self.recorder.stage(name, records) as info:
+            if self.profiler and self.profile_stage == name:
+                with self.profiler.section(name):
+                    yield info
+            else:
+                yield info
+
+    def print_profile(self):
+        """In các hàm tốn thời gian nhất và nơi lưu kết quả profile"""
+        print(f"\n🔬 HÀM TỐN THỜI GIAN NHẤT ({', '.join(self.profiler.sections)}):")
+        for line in self.profiler.hotspots():
+            print(f"   {line}")
+        print(f"📄 Đã lưu profile: {self.profiler.path} (tóm tắt: {self.profiler.path}.txt)")
+
+    def summary_report(self) -> Optional[Dict[str, Any]]:
+        """Thống kê dữ liệu đã xử lý đưa vào báo cáo, lớp con có thể ghi đè"""
+        return self.processed_stats.to_dict() if self.processed_stats else None
+
+    def write_run_report(self, command: str, ok: bool, total: float) -> bool:
+        """Ghi báo cáo lần chạy (số liệu từng bước + thống kê) ra self.report_file"""
+        peak_rss = peak_rss_mb()
+        report = {
+            'category': self.menu_title.lower(),
+            'command': command,
+            'ok': ok,
+            'generatedAt': datetime.now().isoformat(timespec='seconds'),
+            'workers': self.workers,
+            'traceMemory': self.recorder.trace_memory,
+            'inputFile': self.input_file,
+            'totalSeconds': round(total, 6),
+            'peakRssMb': round(peak_rss, 2) if peak_rss is not None else None,
+            'stages': self.recorder.to_dict(),
+            'summary': self.summary_report(),
+        }
+        return self.save_json_data(report, self.report_file)
+
+    def run_command(self, command: str) -> Tuple[bool, float]:
+        """Chạy một lệnh trong COMMANDS, in bảng thời gian và ghi báo cáo lần chạy"""
+        self.recorder.reset()
+        profile_command = self.profiler is not None and self.profile_stage is None
+        sections = len(self.profiler.sections) if self.profiler else 0
+        started = time.perf_counter()
+        with self.profiler.section(command) if profile_command else nullcontext():
+            ok = getattr(self, COMMANDS[command][0])()
+        total = time.perf_counter() - started
+
+        if self.recorder.stages:
+            self.recorder.print_table()
+            print(f"   {'Tổng':<16}{total:>10.3f}")
+            self.write_run_report(command, ok, total)
+        if self.profiler and len(self.profiler.sections) > sections:
+            self.print_profile()
+        return ok, total
+
+    def _load_records(self) -> Optional[List[Dict[str, Any]]]:
+        """Kiểm tra, đọc file đầu vào và trích xuất bản ghi
+
+        Bản ghi được giữ lại trong phiên và dùng chung cho các chức năng sau,
+        chỉ đọc lại khi file đầu vào đổi (đường dẫn, mtime hoặc kích thước).
+        Các chức năng không được sửa trực tiếp danh sách trả về.
+        """
+        if not self.check_input_file():
+            return None
+
+        signature = self._input_signature()
+        if self._records_cache and self._records_cache[0] == signature:
+            print(f"♻️ Dùng lại dữ liệu đã đọc: {self.input_file} (file chưa thay đổi)")
+            return self._records_cache[1]
+
+        with self._stage('load'):
+            raw_data = self.load_json_data()
+        if not raw_data:
+            return None
+
+        with self._stage('extract') as stage:
+            records = self.extract_records(raw_data)
+            stage['records'] = len(records)
+        self._records_cache = (signature, records)
+        return records
+
+    def option_1_simple_extract(self) -> bool:
+        """Chức năng 1: Trích xuất đơn giản"""
+        print(f"\n🔍 ĐANG TRÍCH XUẤT DỮ LIỆU{self._heading} ĐƠN GIẢN...")
+
+        records = self._load_records()
+        if records is None:
+            return False
+        print(f"📊 Đã trích xuất {len(records)} {self.count_label}")
+
+        with self._stage('save_extracted', len(records)):
+            saved = self.save_json_data(records, self.extracted_file)
+        if saved:
+            self.print_quick_stats(records)
+        return saved
+
+    def option_2_advanced_process(self) -> bool:
+        """Chức năng 2: Xử lý đầy đủ"""
+        print(f"\n⚙️ ĐANG XỬ LÝ DỮ LIỆU{self._heading} ĐẦY ĐỦ...")
+
+        records = self._load_records()
+        if records is None:
+            return False
+        print(f"📊 Đã trích xuất {len(records)} {self.count_label}")
+
+        with self._stage('process', len(records)):
+            processed_data = self.process_records(records)
+        print(f"✅ Đã xử lý {len(processed_data)} {self.count_label}")
+
+        with self._stage('save_processed', len(processed_data)):
+            saved = self.save_json_data(processed_data, self.processed_file)
+        if saved:
+            print(f"📄 Đã lưu file dữ liệu đã xử lý: {self.processed_file}")
+            self.print_quick_stats_from_processed(processed_data, self.processed_stats)
+        return saved
+
+    def option_3_create_csv(self) -> bool:
+        """Chức năng 3: Tạo CSV"""
+        print(f"\n📊 ĐANG TẠO FILE CSV{self._heading}...")
+
+        records = self._load_records()
+        if records is None:
+            return False
+        print(f"📊 Đã trích xuất {len(records)} {self.count_label}")
+
+        with self._stage('csv', len(records)):
+            saved = self.save_csv_data(records)
+        if saved:
+            print(f"📈 Số dòng CSV: {len(records)}")
+        return saved
+
+    def option_4_run_all(self) -> bool:
+        """Chức năng 4: Chạy tất cả"""
+        print(f"\n🚀 ĐANG CHẠY TẤT CẢ CHỨC NĂNG{self._heading}...")
+
+        records = self._load_records()
+        if records is None:
+            return False
+        print(f"📊 Đã trích xuất {len(records)} {self.count_label}")
+
+        # 1. Lưu dữ liệu đơn giản
+        print("\n1️⃣ Lưu dữ liệu đơn giản...")
+        with self._stage('save_extracted', len(records)):
+            ok = self.save_json_data(records, self.extracted_file)
+
+        # 2. Xử lý đầy đủ
+        print("\n2️⃣ Xử lý dữ liệu đầy đủ...")
+        with self._stage('process', len(records)):
+            processed_data = self.process_records(records)
+        with self._stage('save_processed', len(processed_data)):
+            ok = self.save_json_data(processed_data, self.processed_file) and ok
+
+        # 3. Tạo CSV
+        print("\n3️⃣ Tạo file CSV...")
+        with self._stage('csv', len(records)):
+            ok = self.save_csv_data(records) and ok
+
+        # In thống kê từ dữ liệu đã xử lý
+        self.print_quick_stats_from_processed(processed_data, self.processed_stats)
+
+        if not ok:
+            print("\n❌ Có bước bị lỗi, xem thông báo ở trên")
+            return False
+
+        print(f"\n✅ HOÀN THÀNH! Đã tạo các file:")
+        print(f"   📄 {self.extracted_file}")
+        print(f"   📄 {self.processed_file}")
+        print(f"   📊 {self.csv_file}")
+        return True
+
+    def option_5_quick_stats(self) -> bool:
+        """Chức năng 5: Thống kê nhanh"""
+        print(f"\n📈 ĐANG TÍNH THỐNG KÊ NHANH{self._heading}...")
+
+        records = self._load_records()
+        if records is None:
+            return False
+        with self._stage('stats', len(records)):
+            self.print_quick_stats(records)
+        return True
+
+    def option_6_settings(self):
+        """Chức năng 6: Cài đặt"""
+        print(f"\n⚙️ CÀI ĐẶT{self._heading}")
+        print(f"📁 File đầu vào: {self.input_file}")
+        print(f"📄 File trích xuất: {self.extracted_file}")
+        print(f"📄 File xử lý: {self.processed_file}")
+        print(f"📊 File báo cáo: {self.report_file}")
+        print(f"📊 File CSV: {self.csv_file}")
+        print(f"⚡ Số tiến trình xử lý: {self.workers}")
+
+        change = input("\n🔄 Bạn có muốn thay đổi đường dẫn file? (y/n): ").lower()
+        if change == 'y':
+            new_input = input(f"📁 File đầu vào mới (hiện tại: {self.input_file}): ").strip()
+            if new_input:
+                self.input_file = new_input
+
+            new_extracted = input(f"📄 File trích xuất mới (hiện tại: {self.extracted_file}): ").strip()
+            if new_extracted:
+                self.extracted_file = new_extracted
+
+            new_processed = input(f"📄 File xử lý mới (hiện tại: {self.processed_file}): ").strip()
+            if new_processed:
+                self.processed_file = new_processed
+
+            new_report = input(f"📊 File báo cáo mới (hiện tại: {self.report_file}): ").strip()
+            if new_report:
+                self.report_file = new_report
+
+            new_csv = input(f"📊 File CSV mới (hiện tại: {self.csv_file}): ").strip()
+            if new_csv:
+                self.csv_file = new_csv
+
+            new_workers = input(f"⚡ Số tiến trình xử lý mới (hiện tại: {self.workers}): ").strip()
+            if new_workers.isdigit() and int(new_workers) > 0:
+                self.workers = int(new_workers)
+
+            print("✅ Đã cập nhật cài đặt!")
+
+    def run(self):
+        """Chạy chương trình chính"""
+        print(f"🚀 {self.menu_title} DATA PROCESSOR - KHỞI ĐỘNG")
+
+        while True:
+            self.display_menu()
+            choice = self.get_user_choice()
+
+            if choice == 0:
+                print("\n👋 Cảm ơn bạn đã sử dụng! Tạm biệt!")
+                break
+            elif 1 <= choice <= len(COMMANDS):
+                # Chức năng 1-5 theo đúng thứ tự trong COMMANDS
+                self.run_command(list(COMMANDS)[choice - 1])
+            elif choice == 6:
+                self.option_6_settings()
+
+            input("\n⏸️ Nhấn Enter để tiếp tục...")
+
+
+class ListingDataProcessor(ProductDataProcessor):
+    """Adapter cho dữ liệu dạng danh sách sản phẩm {"data": {"products": [...]}}"""
+
+    # Nhãn ngắn dùng trong "Trung bình hình/<nhãn>"
+    short_label = 'sản phẩm'
+
+    def describe_raw_data(self, data: Dict[str, Any]):
+        """In cấu trúc dữ liệu thô để debug"""
+        print(f"📊 Success: {data.get('success', 'N/A')}")
+        print(f"📊 Message: {data.get('message', 'N/A')}")
+
+        if 'data' in data and isinstance(data['data'], dict):
+            data_info = data['data']
+            print(f"📊 Total products: {data_info.get('total', 'N/A')}")
+
+            if 'products' in data_info and isinstance(data_info['products'], list):
+                print(f"📊 Products count: {len(data_info['products'])}")
+
+                # Kiểm tra cấu trúc sản phẩm đầu tiên
+                if len(data_info['products']) > 0:
+                    first_product = data_info['products'][0]
+                    print(f"🔍 First product keys: {list(first_product.keys())}")
+
+                    if 'detail' in first_product:
+                        detail = first_product['detail']
+                        print(f"🔍 Detail keys: {list(detail.keys())}")
+
+    def extract_records(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Trích xuất dữ liệu sản phẩm từ JSON"""
+        records = []
+
+        if not isinstance(raw_data, dict) or 'data' not in raw_data:
+            print("❌ Cấu trúc dữ liệu không hợp lệ")
+            return records
+
+        data_section = raw_data['data']
+        if not isinstance(data_section, dict) or 'products' not in data_section:
+            print("❌ Không tìm thấy danh sách sản phẩm")
+            return records
+
+        products = data_section['products']
+        if not isinstance(products, list):
+            print("❌ Products không phải là danh sách")
+            return records
+
+        for product in products:
+            if not isinstance(product, dict):
+                print(f"⚠️ Bỏ qua sản phẩm không hợp lệ: {type(product)}")
+                continue
+
+            # Trích xuất thông tin cơ bản
+            record = {
+                'name': product.get('name', ''),
+                'brand': product.get('brand', ''),
+                'price': product.get('price', ''),
+                'priceOld': product.get('priceOld', ''),
+                'discount': product.get('discount', ''),
+                'image': product.get('image', ''),
+                'color': product.get('color', ''),
+                'specifications': [],
+                'colorOptions': [],
+                'images': []
+            }
+
+            # Trích xuất thông tin chi tiết từ detail
+            detail = product.get('detail')
+            if isinstance(detail, dict):
+                # Cập nhật thông tin từ detail nếu có
+                if detail.get('title'):
+                    record['name'] = detail['title']
+                if detail.get('price'):
+                    record['price'] = detail['price']
+                if detail.get('priceOld'):
+                    record['priceOld'] = detail['priceOld']
+
+                record['specifications'] = detail.get('specifications', [])
+                record['colorOptions'] = detail.get('colorOptions', [])
+                record['images'] = detail.get('images', [])
+
+            records.append(record)
+
+        return records
+
+    def process_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Xử lý một sản phẩm"""
+        return {
+            'name': record['name'],
+            'brand': record['brand'],
+            'price': self.clean_price_data(record['price']),
+            'priceOld': self.clean_price_data(record['priceOld']),
+            'discount': record['discount'],
+            'image': record['image'],
+            'color': record['color'],
+            'specifications': self.process_specifications(record['specifications']),
+            'colorOptions': self.process_color_options(record['colorOptions']),
+            'images': self.process_images(record['images']),
+            'summary': {
+                'specCount': len(record['specifications']),
+                'colorCount': len(record['colorOptions']),
+                'imageCount': len(record['images']),
+                'hasDiscount': bool(record['discount']),
+                'hasOldPrice': bool(record['priceOld'])
+            }
+        }
+
+    def csv_row(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Một dòng CSV từ sản phẩm"""
+        return {
+            'name': record['name'],
+            'brand': record['brand'],
+            'price': record['price'],
+            'priceOld': record['priceOld'],
+            'discount': record['discount'],
+            'image': record['image'],
+            'color': record['color'],
+            'specifications_count': len(record['specifications']),
+            'color_options_count': len(record['colorOptions']),
+            'images_count': len(record['images']),
+            'specifications': json.dumps(record['specifications'], ensure_ascii=False),
+            'color_options': json.dumps(record['colorOptions'], ensure_ascii=False),
+            'images': json.dumps(record['images'], ensure_ascii=False)
+        }
+
+    def print_quick_stats_from_processed(self, processed_data: List[Dict[str, Any]], stats: Optional[ProductStats] = None):
+        """In thống kê nhanh từ dữ liệu đã xử lý (stats: số liệu đã tính sẵn, nếu có)"""
+        if stats is None:
+            stats = ProductStats.from_records(processed_data)
+        total = stats.total
+
+        print(f"\n📊 THỐNG KÊ DỮ LIỆU{self._heading} ĐÃ XỬ LÝ:")
+        print(f"   {self.icon} Tổng số {self.count_label}: {total}")
+        print(f"   📝 Có tên: {stats.with_name}/{total} ({stats.percent(stats.with_name):.1f}%)")
+        print(f"   🏷️ Có brand: {stats.with_brand}/{total} ({stats.percent(stats.with_brand):.1f}%)")
+        print(f"   💰 Có giá: {stats.with_price}/{total} ({stats.percent(stats.with_price):.1f}%)")
+        print(f"   📋 Có thông số: {stats.with_specs}/{total} ({stats.percent(stats.with_specs):.1f}%)")
+        print(f"   🖼️ Có hình ảnh: {stats.with_images}/{total} ({stats.percent(stats.with_images):.1f}%)")
+        print(f"   🎨 Có màu sắc: {stats.with_colors}/{total} ({stats.percent(stats.with_colors):.1f}%)")
+
+        # Thống kê giá
+        if stats.prices.count:
+            print(f"   💰 Khoảng giá: {stats.prices.min:,}₫ - {stats.prices.max:,}₫")
+
+        # Thống kê brand
+        if stats.brands:
+            top_brands = stats.brands.most_common(5)
+            print(f"   🏷️ Top brands: {', '.join([f'{brand}({count})' for brand, count in top_brands])}")
+
+        # Thống kê hình ảnh
+        if stats.images.count:
+            print(f"   🖼️ Tổng hình ảnh: {stats.images.total}")
+            print(f"   🖼️ Trung bình hình/{self.short_label}: {stats.images.mean:.1f}")
+
+    def print_quick_stats(self, records: List[Dict[str, Any]]):
+        """In thống kê nhanh"""
+        total = len(records)
+
+        with_name = sum(1 for p in records if p['name'])
+        with_brand = sum(1 for p in records if p['brand'])
+        with_price = sum(1 for p in records if p['price'])
+        with_specs = sum(1 for p in records if p['specifications'])
+        with_images = sum(1 for p in records if p['images'])
+        with_colors = sum(1 for p in records if p['colorOptions'])
+
+        print(f"\n📊 THỐNG KÊ NHANH:")
+        print(f"   {self.icon} Tổng số {self.count_label}: {total}")
+        print(f"   📝 Có tên: {with_name}/{total} ({with_name/total*100:.1f}%)")
+        print(f"   🏷️ Có brand: {with_brand}/{total} ({with_brand/total*100:.1f}%)")
+        print(f"   💰 Có giá: {with_price}/{total} ({with_price/total*100:.1f}%)")
+        print(f"   📋 Có thông số: {with_specs}/{total} ({with_specs/total*100:.1f}%)")
+        print(f"   🖼️ Có hình ảnh: {with_images}/{total} ({with_images/total*100:.1f}%)")
+        print(f"   🎨 Có màu sắc: {with_colors}/{total} ({with_colors/total*100:.1f}%)")
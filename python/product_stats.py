@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thống kê một lượt (streaming) cho dữ liệu sản phẩm đã xử lý
+
+RunningStats giữ count/min/max/tổng và phương sai (thuật toán Welford) cùng
+một mẫu ngẫu nhiên kích thước cố định (reservoir sampling) để ước lượng phân
+vị: bộ nhớ không phụ thuộc số bản ghi, phân vị chính xác khi số bản ghi không
+vượt quá kích thước mẫu.
+ProductStats gom mọi con số mà các báo cáo/thống kê nhanh cần trong một lần
+duyệt, có thể cập nhật ngay trong lúc xử lý (process_records) hoặc từ bất kỳ
+iterable nào (kể cả đọc dần từ file).
+"""
+
+import math
+import random
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Kích thước mẫu dùng để tính phân vị
+RESERVOIR_SIZE = 1024
+
+
+class RunningStats:
+    """Thống kê một dãy số theo từng giá trị, không giữ toàn bộ dãy"""
+
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE, seed: int = 0):
+        self.count = 0
+        self.total = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._reservoir_size = reservoir_size
+        self._reservoir: List[float] = []
+        self._sorted: Optional[List[float]] = None
+        # Seed cố định để báo cáo lặp lại được
+        self._random = random.Random(seed)
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if len(self._reservoir) < self._reservoir_size:
+            self._reservoir.append(value)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < self._reservoir_size:
+                self._reservoir[slot] = value
+        self._sorted = None
+
+    @property
+    def mean(self) -> float:
+        # Dùng tổng chính xác thay vì trung bình Welford để khớp sum/len
+        return self.total / self.count if self.count else 0
+
+    @property
+    def variance(self) -> float:
+        """Phương sai tổng thể"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, q: float) -> float:
+        """Phân vị q (0-100) theo nearest-rank trên mẫu"""
+        if not self._reservoir:
+            return 0
+        if self._sorted is None:
+            self._sorted = sorted(self._reservoir)
+        values = self._sorted
+        index = min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))
+        return values[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.min is not None else 0,
+            'max': self.max if self.max is not None else 0,
+            'mean': self.mean,
+            'stdev': self.stdev,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+
+class ProductStats:
+    """Số liệu của bản ghi đã xử lý (mọi danh mục), tính trong một lượt duyệt"""
+
+    def __init__(self):
+        self.total = 0
+        self.with_name = 0
+        self.with_brand = 0
+        self.with_price = 0
+        self.with_discount = 0
+        self.with_specs = 0
+        self.with_images = 0
+        self.with_colors = 0
+        self.prices = RunningStats()
+        self.images = RunningStats()
+        self.colors = RunningStats()
+        self.specs = RunningStats()
+        self.storage = RunningStats()
+        self.brands: Counter = Counter()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'ProductStats':
+        stats = cls()
+        stats.update(records)
+        return stats
+
+    def update(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]):
+        self.total += 1
+        # Điện thoại dùng 'title', các danh mục khác dùng 'name'
+        if record.get('name') or record.get('title'):
+            self.with_name += 1
+        brand = record.get('brand')
+        if brand:
+            self.with_brand += 1
+            self.brands[brand] += 1
+        price = record['price']['numeric']
+        if price > 0:
+            self.with_price += 1
+            self.prices.add(price)
+        if record.get('discount'):
+            self.with_discount += 1
+
+        summary = record['summary']
+        spec_count = summary['specCount']
+        image_count = summary['imageCount']
+        color_count = summary['colorCount']
+        self.with_specs += spec_count > 0
+        self.with_images += image_count > 0
+        self.with_colors += color_count > 0
+        self.specs.add(spec_count)
+        self.images.add(image_count)
+        self.colors.add(color_count)
+        if 'storageCount' in summary:
+            self.storage.add(summary['storageCount'])
+
+    def percent(self, count: int) -> float:
+        return count / self.total * 100 if self.total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'withName': self.with_name,
+            'withBrand': self.with_brand,
+            'withPrice': self.with_price,
+            'withDiscount': self.with_discount,
+            'withSpecs': self.with_specs,
+            'withImages': self.with_images,
+            'withColors': self.with_colors,
+            'price': self.prices.to_dict(),
+            'images': self.images.to_dict(),
+            'colors': self.colors.to_dict(),
+            'specs': self.specs.to_dict(),
+            'storage': self.storage.to_dict(),
+            'topBrands': self.brands.most_common(5),
+        }
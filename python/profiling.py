@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profile một phần của lần chạy bằng cProfile, kèm tracemalloc nếu cần
+
+Dùng chung cho các processor (--profile / PROCESS_PROFILE) và
+data/upload_data.py (--profile / UPLOAD_PROFILE). Chỉ đoạn được bọc trong
+`section(label)` bị profile, nên dùng được cả với menu tương tác và có thể
+chọn riêng một bước. Luồng tạo ra trong lúc profile (ThreadPoolExecutor khi
+upload) cũng được profile, thời gian của các luồng được cộng dồn nên có thể
+lớn hơn thời gian thực; tiến trình con (ProcessPoolExecutor) thì không.
+
+Sau mỗi đoạn, số liệu được cộng dồn và ghi lại:
+  - <file>: dữ liệu pstats, mở bằng `python -m pstats <file>` hoặc snakeviz
+  - <file>.txt: top N hàm theo tottime và cumulative, kèm top N dòng đang
+    giữ nhiều bộ nhớ nhất ở cuối từng đoạn khi bật trace_memory
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Số hàm / dòng cấp phát in trong phần tóm tắt
+PROFILE_TOP = 25
+
+
+class SectionProfiler:
+    """Gom kết quả profile của các đoạn đã chạy vào một file pstats"""
+
+    def __init__(self, path: str, top: int = PROFILE_TOP, trace_memory: bool = False):
+        self.path = path
+        self.top = top
+        self.trace_memory = trace_memory
+        self.sections: List[str] = []
+        self.stats: Optional[pstats.Stats] = None
+        # Top dòng giữ nhiều bộ nhớ nhất ở cuối mỗi đoạn (đã định dạng)
+        self.allocations: Dict[str, List[str]] = {}
+
+    @contextmanager
+    def section(self, label: str) -> Iterator[None]:
+        profiles: List[cProfile.Profile] = []
+        lock = threading.Lock()
+
+        def profile_thread(*_):
+            # Gọi một lần ở đầu mỗi luồng mới, sau đó cProfile thay thế hàm này
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                sys.setprofile(None)
+                return
+            with lock:
+                profiles.append(profile)
+
+        started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        main = cProfile.Profile()
+        threading.setprofile(profile_thread)
+        main.enable()
+        try:
+            yield
+        finally:
+            main.disable()
+            threading.setprofile(None)
+            snapshot = tracemalloc.take_snapshot() if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+            with lock:
+                self._add(label, [main, *profiles], snapshot)
+
+    def _add(self, label: str, profiles: List[cProfile.Profile], snapshot: Optional[tracemalloc.Snapshot]):
+        stats = pstats.Stats(*profiles)
+        if self.stats is None:
+            self.stats = stats
+        else:
+            self.stats.add(stats)
+        self.sections.append(label)
+        if snapshot is not None:
+            self.allocations[label] = [
+                f"{stat.size / 1024:>10.1f} KB {stat.count:>8} lần  {stat.traceback}"
+                for stat in snapshot.statistics('lineno')[:self.top]
+            ]
+        self.write()
+
+    def write(self):
+        """Ghi file pstats và file tóm tắt <file>.txt"""
+        if self.stats is None:
+            return
+        self.stats.dump_stats(self.path)
+        out = io.StringIO()
+        out.write(f"Đoạn đã profile: {', '.join(self.sections)}\n")
+        self.stats.stream = out
+        for sort_key in ('tottime', 'cumulative'):
+            self.stats.sort_stats(sort_key).print_stats(self.top)
+        for label, lines in self.allocations.items():
+            out.write(f"\nBộ nhớ còn giữ nhiều nhất ở cuối đoạn {label}:\n")
+            out.write("\n".join(lines) + "\n")
+        self.stats.stream = sys.stdout
+        with open(f"{self.path}.txt", 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+
+    def hotspots(self, limit: int = 10) -> List[str]:
+        """Các dòng bảng top `limit` hàm tốn thời gian nhất (tottime)"""
+        if self.stats is None:
+            return []
+        rows = sorted(self.stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        lines = [f"{'tottime':>9}{'cumtime':>9}{'ncalls':>10}  hàm"]
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in rows:
+            where = f"{os.path.basename(filename)}:{line}({name})" if line else name
+            lines.append(f"{tottime:>9.3f}{cumtime:>9.3f}{ncalls:>10}  {where}")
+        return lines
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đo từng bước của processor: thời gian, số bản ghi/giây và bộ nhớ đỉnh
+
+Mỗi bước (load, extract, process, save_*...) được bọc trong `stage(name)`,
+số liệu cộng dồn nếu một bước chạy nhiều lần trong cùng lệnh:
+  - seconds / records / recordsPerSec
+  - peakRssMb: mức RSS cao nhất của tiến trình tính tới cuối bước (ru_maxrss),
+    rssGrowthMb: phần bước đó đẩy mức cao nhất lên thêm
+  - tracemallocPeakMb: bộ nhớ Python cấp phát đỉnh trong bước, chỉ khi bật
+    trace_memory (tracemalloc làm chậm đáng kể nên mặc định tắt)
+Tiến trình con của ProcessPoolExecutor không được tính vào RSS/tracemalloc.
+Trên Windows không có module `resource` nên các trường RSS là null.
+"""
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Mức RSS cao nhất của tiến trình hiện tại (MB), None nếu không đo được"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về bytes
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+class StageRecorder:
+    """Số liệu các bước của lệnh đang chạy"""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def reset(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str, records: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Đo một bước; số bản ghi truyền vào hoặc gán `info['records']` bên trong khối with"""
+        info: Dict[str, Any] = {'records': records}
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        try:
+            yield info
+        finally:
+            seconds = time.perf_counter() - started
+            traced_peak = tracemalloc.get_traced_memory()[1] / MB if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+            self._add(name, seconds, info['records'], rss_before, peak_rss_mb(), traced_peak)
+
+    def _add(self, name: str, seconds: float, records: Optional[int], rss_before: Optional[float],
+             rss_after: Optional[float], traced_peak: Optional[float]):
+        entry = self.stages.setdefault(name, {
+            'seconds': 0.0, 'calls': 0, 'records': None,
+            'peakRssMb': None, 'rssGrowthMb': None, 'tracemallocPeakMb': None,
+        })
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+        if records is not None:
+            entry['records'] = (entry['records'] or 0) + records
+        if rss_after is not None:
+            entry['peakRssMb'] = rss_after
+            entry['rssGrowthMb'] = (entry['rssGrowthMb'] or 0.0) + rss_after - rss_before
+        if traced_peak is not None:
+            entry['tracemallocPeakMb'] = max(entry['tracemallocPeakMb'] or 0.0, traced_peak)
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Thời gian (giây) từng bước"""
+        return {name: entry['seconds'] for name, entry in self.stages.items()}
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, entry in self.stages.items():
+            seconds, records = entry['seconds'], entry['records']
+            result[name] = {
+                'seconds': round(seconds, 6),
+                'calls': entry['calls'],
+                'records': records,
+                'recordsPerSec': round(records / seconds, 1) if records and seconds > 0 else None,
+                'peakRssMb': _round(entry['peakRssMb']),
+                'rssGrowthMb': _round(entry['rssGrowthMb']),
+                'tracemallocPeakMb': _round(entry['tracemallocPeakMb']),
+            }
+        return result
+
+    def print_table(self):
+        if not self.stages:
+            return
+        print(f"\n⏱️ THỜI GIAN TỪNG BƯỚC:")
+        print(f"   {'Bước':<16}{'Giây':>10}{'Bản ghi/giây':>15}{'RSS đỉnh (MB)':>16}{'tracemalloc (MB)':>19}")
+        for name, entry in self.to_dict().items():
+            rate = f"{entry['recordsPerSec']:,.0f}" if entry['recordsPerSec'] is not None else '-'
+            rss = f"{entry['peakRssMb']:.1f}" if entry['peakRssMb'] is not None else '-'
+            traced = f"{entry['tracemallocPeakMb']:.1f}" if entry['tracemallocPeakMb'] is not None else '-'
+            print(f"   {name:<16}{entry['seconds']:>10.3f}{rate:>15}{rss:>16}{traced:>19}")
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""CatalogColumns: brand suy từ tên khi thiếu, phân bố giảm giá không bỏ sót giá trị ngoài khoảng"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python"))
+
+from catalog_analytics import CatalogColumns, product_brand
+
+
+def make_record(price, price_old=0, discount="", **fields):
+    return {"price": {"numeric": price}, "priceOld": {"numeric": price_old}, "discount": discount, **fields}
+
+
+@pytest.mark.parametrize("record, brand", [
+    ({"title": "Điện thoại iPhone 17 Pro Max 256GB"}, "iPhone"),
+    ({"name": "Máy tính bảng Samsung Galaxy Tab S10"}, "Samsung"),
+    ({"name": "Garmin Forerunner 965", "brand": "Garmin"}, "Garmin"),
+    ({"title": ""}, ""),
+])
+def test_product_brand(record, brand):
+    assert product_brand(record) == brand
+
+
+def test_brand_quantiles_include_phones_without_brand_field():
+    columns = CatalogColumns([
+        make_record(10_000_000, title="Điện thoại OPPO Reno 14"),
+        make_record(12_000_000, title="Điện thoại OPPO Find X8"),
+        make_record(5_000_000, name="OPPO Watch X", brand="OPPO"),
+        make_record(1_000_000, title=""),
+    ])
+    rows = {row["brand"]: row for row in columns.brand_price_quantiles()}
+    assert rows["OPPO"]["count"] == 3
+    assert columns.report()["brandMissing"] == 1
+
+
+def test_discount_bins_sum_to_discounted_total():
+    columns = CatalogColumns([
+        make_record(900, 1000),                 # 10% từ giá cũ
+        make_record(1000, discount="-2%"),      # dưới ngưỡng đầu của bins tùy chỉnh
+        make_record(1000, discount="-150%"),    # nhãn lỗi trên 100%
+        make_record(1000, discount="-100%"),    # đúng cạnh cuối
+        make_record(1000),                      # không giảm giá
+    ])
+    default = columns.discount_distribution()
+    assert default["none"] == 1
+    assert default["above"] == 1
+    assert default["below"] + default["above"] + sum(b["count"] for b in default["bins"]) == default["discounted"] == 4
+
+    custom = columns.discount_distribution(bins=(5, 50, 100))
+    assert custom["below"] == 1
+    assert custom["below"] + custom["above"] + sum(b["count"] for b in custom["bins"]) == custom["discounted"]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""CategoryClassifier: một lần quét, danh mục ưu tiên cao nhất thắng"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+
+from category_classifier import CategoryClassifier
+
+
+@pytest.fixture
+def classifier():
+    return CategoryClassifier()
+
+
+@pytest.mark.parametrize("name, category", [
+    ("iPhone 15 Pro Max 256GB", "phone"),
+    ("MacBook Air M2 13 inch", "laptop"),
+    ("Đồng hồ thông minh Huawei Watch GT 4", "smartwatch"),
+    ("Máy tính bảng iPad Air 5", "tablet"),
+    ("Apple Watch Series 9 kết nối iPhone", "phone"),
+    ("Bao da iPad kiêm giá đỡ laptop", "laptop"),
+    ("laptophone", "phone"),
+    ("Tai nghe Sony WH-1000XM5", "default"),
+    ("", "default"),
+    (None, "default"),
+])
+def test_category_priority(classifier, name, category):
+    assert classifier.category(name) == category
+
+
+def test_classify_reads_env_override(monkeypatch):
+    monkeypatch.setenv("CATEGORY_ID_TABLET", "42")
+    assert CategoryClassifier().classify("Samsung Galaxy Tab S9 tablet") == 42
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""iter_json_array đọc như json.load và từ chối cùng loại đầu vào lỗi"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+
+from json_stream import iter_json_array
+
+
+def write(tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "[1, 2 ,3]", '[{"a": [1, 2]}, "x"]'])
+def test_matches_json_load(tmp_path, text):
+    assert list(iter_json_array(write(tmp_path, text))) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["[1,]", "[1, ]", "[,]", "[,1]", "[1 2]", "[1,,2]", "[1", ""])
+def test_rejects_malformed_input(tmp_path, text):
+    with pytest.raises(ValueError):
+        json.loads(text)
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, text)))
+
+
+def test_rejects_non_array(tmp_path):
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, '{"a": 1}')))
+
+
+def test_trailing_comma_across_chunks(tmp_path):
+    path = write(tmp_path, "[" + ", ".join(str(i) for i in range(50)) + ",\n]")
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, chunk_size=7))
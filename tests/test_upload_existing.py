@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Tải danh sách slug đã có khi server giới hạn kích thước trang hoặc phân trang khác mặc định"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+
+from upload_existing import fetch_existing_slugs
+
+PRODUCTS = [{"id": i, "slug": f"product-{i}"} for i in range(1, 251)]
+
+
+def make_server(page_cap: int, page_param: str = "page", size_param: str = "limit", page_base: int = 1,
+                envelope: str = "total"):
+    """Server trả tối đa page_cap product mỗi trang, bất kể tham số kích thước trang"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query)
+            page = int(query.get(page_param, [page_base])[0]) - page_base
+            size = min(int(query.get(size_param, [page_cap])[0]), page_cap)
+            items = PRODUCTS[page * size:(page + 1) * size]
+            total_pages = -(-len(PRODUCTS) // size)
+            if envelope == "total":
+                body = {"data": items, "page": page + page_base, "limit": size, "total": len(PRODUCTS)}
+            elif envelope == "spring":
+                body = {"content": items, "number": page, "size": size, "totalPages": total_pages,
+                        "totalElements": len(PRODUCTS), "last": page + 1 >= total_pages}
+            else:
+                body = items
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        server, url = make_server(**kwargs)
+        servers.append(server)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+@pytest.mark.parametrize("envelope", ["total", "plain"])
+def test_server_caps_page_size(serve, envelope):
+    base_url = serve(page_cap=20, envelope=envelope)
+    slugs = fetch_existing_slugs(requests.Session(), base_url, page_size=100)
+    assert len(slugs) == len(PRODUCTS)
+    assert slugs["product-250"] == 250
+
+
+def test_spring_zero_based_pages(serve):
+    base_url = serve(page_cap=30, page_param="page", size_param="size", page_base=0, envelope="spring")
+    slugs = fetch_existing_slugs(requests.Session(), base_url, page_size=100, size_param="size", page_base=0)
+    assert len(slugs) == len(PRODUCTS)
+
+
+def test_wrong_page_base_is_reported(serve, capsys):
+    base_url = serve(page_cap=50, page_base=0)
+    slugs = fetch_existing_slugs(requests.Session(), base_url, page_size=50, page_base=1)
+    assert len(slugs) == len(PRODUCTS) - 50
+    assert "EXISTING_PAGE_BASE" in capsys.readouterr().out
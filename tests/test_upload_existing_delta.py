@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""--existing cùng --delta/--journal: product đã biết vẫn được cập nhật, mode update gửi cả request con"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+
+from mock_api import start_mock_server
+from upload_data import upload_products
+from upload_existing import ExistingProducts
+
+
+def make_product(name, price, colors=("Đen",)):
+    return {
+        "name": name,
+        "price": {"numeric": price},
+        "colorOptions": [{"name": color, "hexColor": "#000000"} for color in colors],
+        "images": {"urls": [f"https://cdn.example/{name}.jpg"]},
+    }
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = start_mock_server()
+    monkeypatch.setenv("API_BASE_URL", server.base_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_products(path, products):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(products, f, ensure_ascii=False)
+
+
+def load_existing(cache_path, mode):
+    with open(cache_path, encoding="utf-8") as f:
+        return ExistingProducts(json.load(f), mode=mode, cache_path=cache_path)
+
+
+@pytest.mark.parametrize("mode", ["skip", "update"])
+def test_delta_changes_not_swallowed_by_existing_cache(server, tmp_path, mode):
+    file_path = str(tmp_path / "products.json")
+    delta_path = str(tmp_path / "products.delta.jsonl")
+    cache_path = str(tmp_path / "existing.json")
+    write_products(file_path, [make_product("Tablet A", 1000), make_product("Tablet B", 2000)])
+    upload_products(file_path, 1, "tablets", workers=1, batch_size=0, delta_path=delta_path,
+                    existing=ExistingProducts(mode=mode, cache_path=cache_path))
+    assert server.stats()["products"] == 2
+
+    # Lần sau: Tablet A đổi giá và có thêm màu, cache existing đã chứa cả hai slug
+    write_products(file_path, [make_product("Tablet A", 1500, ("Đen", "Trắng")), make_product("Tablet B", 2000)])
+    upload_products(file_path, 1, "tablets", workers=1, batch_size=0, delta_path=delta_path,
+                    existing=load_existing(cache_path, mode))
+
+    stats = server.stats()
+    assert stats["products"] == 2
+    assert stats["requests"].get("PUT /api/v1/products/1 200") == 1
+    assert stats["children"]["color"] == 3
+    assert server.products[1]["price"] == 1500
+
+    # Delta index đã ghi trạng thái mới: lần chạy thứ ba không gửi gì
+    requests_before = sum(server.stats()["requests"].values())
+    upload_products(file_path, 1, "tablets", workers=1, batch_size=0, delta_path=delta_path,
+                    existing=load_existing(cache_path, mode))
+    assert sum(server.stats()["requests"].values()) == requests_before
+
+
+def test_update_mode_sends_children_and_records_journal(server, tmp_path):
+    file_path = str(tmp_path / "products.json")
+    journal_path = str(tmp_path / "products.journal.jsonl")
+    write_products(file_path, [make_product("Tablet A", 1000, ("Đen", "Trắng"))])
+    product_id = server.new_id()
+    server.products[product_id] = {"slug": "tablet-a", "price": 900}
+
+    existing = ExistingProducts({"tablet-a": product_id}, mode="update")
+    upload_products(file_path, 1, "tablets", workers=2, batch_size=0, journal_path=journal_path, existing=existing)
+
+    stats = server.stats()
+    assert stats["products"] == 1
+    assert stats["requests"].get(f"PUT /api/v1/products/{product_id} 200") == 1
+    assert stats["children"] == {"color": 2, "image": 1, "specification": 0}
+
+    # Journal đã ghi product và request con: chạy lại không gửi thêm gì
+    requests_before = sum(stats["requests"].values())
+    upload_products(file_path, 1, "tablets", workers=2, batch_size=0, journal_path=journal_path,
+                    existing=ExistingProducts({"tablet-a": product_id}, mode="update"))
+    assert sum(server.stats()["requests"].values()) == requests_before
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Retry của UploadSession: POST không được gửi lại khi có thể server đã nhận request"""
+
+import os
+import socket
+import sys
+import threading
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+
+from upload_data import UploadSession
+from upload_retry import RetryPolicy, is_connect_error
+
+
+class AbortingServer:
+    """Đọc hết request rồi đóng kết nối không trả lời ("Connection aborted")"""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        self.requests = 0
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                data = b""
+                while b"\r\n\r\n" not in data:
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+                self.requests += 1
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def server():
+    server = AbortingServer()
+    yield server
+    server.close()
+
+
+def make_session() -> UploadSession:
+    session = UploadSession(retries=3)
+    session.retry = RetryPolicy(3, base_delay=0.001)
+    return session
+
+
+def test_post_not_retried_after_connection_aborted(server):
+    session = make_session()
+    with pytest.raises(requests.ConnectionError) as excinfo:
+        session.post(f"{server.url}/api/v1/products", json={"name": "x"}, timeout=5)
+    assert not is_connect_error(excinfo.value)
+    assert server.requests == 1
+    assert session.stats.retries == 0
+
+
+def test_put_retried_after_connection_aborted(server):
+    session = make_session()
+    with pytest.raises(requests.ConnectionError):
+        session.put(f"{server.url}/api/v1/products/1", json={"name": "x"}, timeout=5)
+    assert server.requests == 4
+
+
+def test_post_retried_when_connection_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    session = make_session()
+    with pytest.raises(requests.ConnectionError) as excinfo:
+        session.post(f"http://127.0.0.1:{port}/api/v1/products", json={"name": "x"}, timeout=5)
+    assert is_connect_error(excinfo.value)
+    assert session.stats.retries == 3